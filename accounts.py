@@ -0,0 +1,173 @@
+"""Per-user state of the MCP server, for one or many Classroom accounts.
+
+An ``Account`` bundles everything that belongs to one user: token file,
+credentials, service object, local store, courses cache, quota scheduler,
+in-flight request deduplication and the thread pool its fan-outs run on. Nothing is shared between accounts, so
+one user's quota or failures never slow down another.
+
+The account a tool call works on is selected through a context variable
+(``using``); helpers deep inside a fetch read it with ``current()``, also on
+the fan-out worker threads, which inherit the caller's context.
+
+By default there is a single account using ``token.json``. In multi-account
+mode every authorized-user token file ``<name>.json`` in a directory becomes
+an account named ``<name>`` with its store in ``<name>.db`` alongside.
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator
+
+from fetching import POOL_SIZE, SingleFlight
+from scheduler import QuotaScheduler
+from store import CourseworkStore
+
+DEFAULT_ACCOUNT = "default"
+
+
+class Account:
+    def __init__(self, name: str, token_path: str, store_path: str, scheduler: QuotaScheduler | None = None):
+        self.name = name
+        self.token_path = token_path
+        self.store_path = store_path
+        self.creds = None
+        self.service = None
+        self.store: CourseworkStore | None = None
+        self.courses_cache: list | None = None
+        # Each account has its own per-user quota.
+        self.scheduler = scheduler or QuotaScheduler()
+        # Identical API requests in flight at once share one call.
+        self.inflight = SingleFlight()
+        # Course list and per-course store syncs in progress, shared the same way.
+        self.syncing = SingleFlight()
+        # Per-thread Http objects (httplib2 is not thread-safe).
+        self.local = threading.local()
+        self.auth_lock = threading.Lock()
+        self._store_lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Account({self.name!r})"
+
+    def get_store(self) -> CourseworkStore:
+        """Open this account's coursework store on first use (once, from any thread)."""
+        if self.store is None:
+            with self._store_lock:
+                if self.store is None:
+                    self.store = CourseworkStore(self.store_path)
+        return self.store
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """This account's fetch pool, started on first use.
+
+        Its worker threads live as long as the account, so the Http each one
+        keeps in ``local`` (and its open connections) is reused across calls.
+        """
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=POOL_SIZE, thread_name_prefix=f"classroom-{self.name}"
+                    )
+        return self._executor
+
+    def reset(self):
+        """Forget cached state (store connection and courses cache)."""
+        if self.store is not None:
+            self.store.close()
+        self.store = None
+        self.courses_cache = None
+
+    def close(self):
+        """Reset and stop the fetch pool (a later fan-out starts a new one)."""
+        self.reset()
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _is_token_file(path: str) -> bool:
+    """Authorized-user token files carry a refresh token (client secrets don't)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return isinstance(data, dict) and "refresh_token" in data
+
+
+class AccountRegistry:
+    def __init__(self):
+        self._accounts: dict[str, Account] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def __iter__(self) -> Iterator[Account]:
+        return iter(list(self._accounts.values()))
+
+    def names(self) -> list[str]:
+        return list(self._accounts)
+
+    def add(self, account: Account) -> Account:
+        with self._lock:
+            self._accounts[account.name] = account
+        return account
+
+    def clear(self):
+        with self._lock:
+            accounts, self._accounts = list(self._accounts.values()), {}
+        for account in accounts:
+            account.close()
+
+    def load_dir(self, directory: str) -> list[str]:
+        """Add an account per token file in directory; returns their names."""
+        names = []
+        for entry in sorted(os.listdir(directory)):
+            path = os.path.join(directory, entry)
+            name, ext = os.path.splitext(entry)
+            if ext == ".json" and _is_token_file(path):
+                self.add(Account(name, path, os.path.join(directory, f"{name}.db")))
+                names.append(name)
+        return names
+
+    def get(self, name: str | None = None) -> Account:
+        """Account by name; without a name, the only (or default) account."""
+        if name is not None:
+            try:
+                return self._accounts[name]
+            except KeyError:
+                raise ValueError(f"unknown account {name!r}; available: {', '.join(self._accounts)}") from None
+        if len(self._accounts) == 1:
+            return next(iter(self._accounts.values()))
+        if DEFAULT_ACCOUNT in self._accounts:
+            return self._accounts[DEFAULT_ACCOUNT]
+        raise ValueError(f"account required; available: {', '.join(self._accounts)}")
+
+
+registry = AccountRegistry()
+atexit.register(registry.clear)
+_selected: contextvars.ContextVar[str | None] = contextvars.ContextVar("classroom_account", default=None)
+
+
+def current() -> Account:
+    """The account selected for the running call (see ``using``)."""
+    return registry.get(_selected.get())
+
+
+@contextmanager
+def using(name: str | None):
+    """Select the account the enclosed code works on (None: the default)."""
+    token = _selected.set(name)
+    try:
+        yield
+    finally:
+        _selected.reset(token)
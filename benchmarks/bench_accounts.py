@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Multi-account sync throughput at different worker counts.
+
+Registers ``--accounts`` fake accounts, each with its own fake backend,
+in-memory store and per-user quota, then syncs all of them with
+main.sync_accounts at each worker count in ``--workers``. Since no account
+shares state or quota with another, wall time should drop roughly in
+proportion to the workers. Every run also checks isolation: each account
+must end up with exactly its own coursework, fetched from its own backend.
+
+    python benchmarks/bench_accounts.py --accounts 32 --workers 1,4,16
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+from accounts import Account, registry  # noqa: E402
+from fake_classroom import FakeClassroom  # noqa: E402
+from scheduler import QuotaScheduler  # noqa: E402
+
+
+def register(n_accounts, courses, per_course, latency, quota):
+    """Fresh registry of fake accounts; returns {name: (backend, tasks)}."""
+    registry.clear()
+    backends = {}
+    for i in range(n_accounts):
+        name = f"user{i:03d}"
+        account = registry.add(
+            Account(name, f"{name}.json", ":memory:", QuotaScheduler(rate=quota, burst=quota))
+        )
+        # Different sizes per account, so data leaking between them shows.
+        size = per_course + i % 3
+        account.service = FakeClassroom(courses, size, latency)
+        backends[name] = (account.service, courses * size)
+    return backends
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=32)
+    parser.add_argument("--courses", type=int, default=8)
+    parser.add_argument("--per-course", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--quota", type=float, default=20, help="calls per second per account")
+    parser.add_argument("--workers", default="1,4,16")
+    args = parser.parse_args()
+
+    print(f"{args.accounts} accounts x {args.courses} courses, {args.latency * 1000:.0f} ms per API call, "
+          f"{args.quota:g} calls/s quota per account\n")
+    print(f"{'workers':>7} {'wall (s)':>9} {'accounts/s':>11} {'speedup':>8} {'API calls':>10}")
+    status = 0
+    baseline = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        backends = register(args.accounts, args.courses, args.per_course, args.latency, args.quota)
+        start = time.perf_counter()
+        summary = main.sync_accounts(max_workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        calls = sum(sum(b.calls.values()) for b, _ in backends.values())
+        print(f"{workers:>7} {elapsed:>9.2f} {args.accounts / elapsed:>11.1f} {baseline / elapsed:>7.1f}x {calls:>10}")
+
+        for entry in summary:
+            account = registry.get(entry["account"])
+            expected = backends[account.name][1]
+            stored = len(account.get_store().coursework())
+            if not entry["ok"] or stored != expected:
+                print(f"  ❌ {account.name}: ok={entry['ok']} stored {stored} tasks, expected {expected}")
+                status = 1
+    registry.clear()
+
+    print("✅ every account synced with its own data" if not status else "❌ accounts not isolated")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Batch question mode: throughput at several concurrency limits.
+
+Runs client.run_batch over ``--questions`` questions (a mix of all tasks,
+one course, a due-date window, pending work and a non-Classroom question)
+against benchmarks/fake_server.py, with the model replaced by a fake that
+streams its reply after ``--llm-latency`` seconds. Each limit in
+``--concurrency`` gets fresh client caches, stats included. Checks that
+every question gets exactly one answer line, with no errors.
+
+    python benchmarks/bench_batch.py --questions 40 --concurrency 1,4,16
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("GITHUB_TOKEN", "unused")
+os.environ.setdefault("CLASSROOM_MCP_URL", str(ROOT / "benchmarks" / "fake_server.py"))
+
+import client  # noqa: E402
+
+QUESTIONS = [
+    "¿Qué tareas tengo?",
+    "¿Qué tareas tengo de Curso 3?",
+    "¿Qué tengo que entregar esta semana?",
+    "¿Qué me falta entregar de Curso 5?",
+    "Hola, ¿cómo estás?",
+]
+
+
+class FakeLLM:
+    """Stands in for AsyncOpenAI: replies after a delay, streamed in chunks."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, stream=True, **kwargs):
+        self.calls += 1
+        if messages[0]["content"] == client.SYSTEM_PROMPT:
+            reply = "¡Hola! Estoy bien, gracias."
+        else:
+            reply = f"Resumen de {messages[1]['content'].split(':', 1)[0]} tareas."
+        await asyncio.sleep(self.latency)
+
+        async def chunks():
+            for i in range(0, len(reply), 8):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=reply[i:i + 8]))])
+
+        return chunks()
+
+
+def fresh(cache):
+    """An empty cache configured like cache, with its stats at zero."""
+    return client.TTLCache(maxsize=cache.maxsize, ttl=cache.ttl, stale_ttl=cache.stale_ttl)
+
+
+def fresh_caches():
+    client.COURSES_CACHE = fresh(client.COURSES_CACHE)
+    client.TASKS_BY_COURSE = fresh(client.TASKS_BY_COURSE)
+    client.TASK_INDEX = client.TaskIndex()
+    client.DUE_INDEX = client.DueIndex(due=client.due_seconds)
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=40)
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    lines = [
+        json.dumps({"id": i, "question": QUESTIONS[i % len(QUESTIONS)]}, ensure_ascii=False)
+        for i in range(args.questions)
+    ]
+    status = 0
+    print(f"{args.questions} questions, model latency {args.llm_latency * 1000:.0f} ms\n")
+    print(f"{'limit':>6} {'wall s':>8} {'q/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'LLM calls':>10}")
+    for limit in (int(x) for x in args.concurrency.split(",")):
+        fresh_caches()
+        client.ai = FakeLLM(args.llm_latency)
+        output = io.StringIO()
+        summary = asyncio.run(client.run_batch(lines, output, limit))
+        answers = [json.loads(line) for line in output.getvalue().splitlines()]
+        print(f"{limit:>6} {summary['seconds']:>8.2f} {summary['per_second']:>7.1f} {summary['p50_ms']:>8.0f} "
+              f"{summary['p95_ms']:>8.0f} {summary['max_ms']:>8.0f} {client.ai.calls:>10}")
+        if summary["failed"] or sorted(a["id"] for a in answers) != list(range(args.questions)):
+            print(f"  ❌ {summary['failed']} failed, {len(answers)} answers for {args.questions} questions")
+            status = 1
+
+    print("\n✅ every question answered" if not status else "\n❌ missing or failed answers")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(run())
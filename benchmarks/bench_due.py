@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Due-date window queries: full scan versus the sorted due index.
+
+For each size in ``--sizes`` builds synthetic coursework spread over a year
+and answers the client's usual windows ("hoy", "esta semana", "este mes",
+"atrasadas", ...) three ways: a full scan with query.filter_tasks, a
+deadlines.DueIndex over the task list (what the client keeps) and
+CourseworkStore.coursework_due (what query_tasks reads). Every way must
+return the same tasks. Also reports the cost of building the index and of
+re-indexing a batch of updated tasks on ingest.
+
+    python benchmarks/bench_due.py --sizes 10000,100000
+"""
+
+import argparse
+import datetime
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deadlines import DueIndex, due_window  # noqa: E402
+from query import filter_tasks, time_window  # noqa: E402
+from store import CourseworkStore  # noqa: E402
+
+QUESTIONS = ["hoy", "mañana", "esta semana", "la próxima semana", "este mes", "atrasadas"]
+TODAY = datetime.date(2026, 3, 4)
+
+
+def make_tasks(n, courses=40, seed=0):
+    rng = random.Random(seed)
+    base = datetime.date(2026, 1, 1)
+    tasks = []
+    for i in range(n):
+        task = {
+            "id": str(i),
+            "courseId": str(1000 + i % courses),
+            "title": f"Tarea {i}",
+            "updateTime": "2026-01-01T00:00:00Z",
+        }
+        if rng.random() > 0.15:
+            due = base + datetime.timedelta(days=rng.randrange(365))
+            task["dueDate"] = {"year": due.year, "month": due.month, "day": due.day}
+            if rng.random() > 0.3:
+                task["dueTime"] = {"hours": rng.randrange(24), "minutes": rng.choice((0, 30, 59))}
+        tasks.append(task)
+    return tasks
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return result, statistics.median(samples)
+
+
+def ids(tasks):
+    return sorted(t["id"] for t in tasks)
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=200, help="updated tasks re-indexed per ingest")
+    args = parser.parse_args()
+
+    status = 0
+    for n in (int(x) for x in args.sizes.split(",")):
+        tasks = make_tasks(n)
+        index, build = timed(lambda: DueIndex(tasks), 1)
+        st = CourseworkStore(":memory:")
+        for cid in sorted({t["courseId"] for t in tasks}):
+            st.replace_coursework(cid, [t for t in tasks if t["courseId"] == cid])
+        _, store_build = timed(lambda: st.coursework_due(0, 0), 1)
+
+        updated = [
+            {**t, "dueDate": {"year": 2026, "month": 6, "day": 1}, "updateTime": "2026-02-01T00:00:00Z"}
+            for t in tasks[:args.batch]
+        ]
+        _, ingest = timed(lambda: [index.add(t) for t in updated], 1)
+        for t in updated:
+            index.add(tasks[int(t["id"])])
+
+        print(f"\n{n} tasks: index built in {build * 1000:.1f} ms (store: {store_build * 1000:.1f} ms), "
+              f"{args.batch} updated tasks re-indexed in {ingest * 1000:.2f} ms")
+        print(f"{'window':<18} {'tasks':>6} {'scan ms':>9} {'index ms':>9} {'store scan':>11} {'store idx':>10}")
+        for question in QUESTIONS:
+            start, end = time_window(question, today=TODAY)
+            scan, scan_t = timed(lambda: list(filter_tasks(tasks, due_after=start, due_before=end)), args.repeat)
+            found, index_t = timed(lambda: index.range(start, end), args.repeat)
+            lo, hi = due_window(start, end)
+            _, store_scan_t = timed(
+                lambda: list(filter_tasks(st.coursework(), due_after=start, due_before=end)), 1
+            )
+            stored, store_t = timed(lambda: st.coursework_due(lo, hi), args.repeat)
+            print(f"{question:<18} {len(found):>6} {scan_t * 1000:>9.3f} {index_t * 1000:>9.3f} "
+                  f"{store_scan_t * 1000:>11.1f} {store_t * 1000:>10.2f}")
+            if not ids(scan) == ids(found) == ids(stored):
+                print(f"  ❌ results differ: scan {len(scan)}, index {len(found)}, store {len(stored)}")
+                status = 1
+        st.close()
+
+    print("\n✅ index and scan agree" if not status else "\n❌ index and scan disagree")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(run())
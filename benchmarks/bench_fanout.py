@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Wall time of the coursework fan-out at different concurrency limits.
+
+Runs main.fetch_coursework against the in-process fake backend, so the
+numbers reflect only round-trip overlap. Expect time to drop roughly in
+proportion to the limit until it reaches the number of courses.
+
+    python benchmarks/bench_fanout.py --courses 40 --latency 0.1
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+from fake_classroom import FakeClassroom  # noqa: E402
+from scheduler import QuotaScheduler  # noqa: E402
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=40)
+    parser.add_argument("--per-course", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--limits", default="1,2,4,8,16")
+    args = parser.parse_args()
+
+    fake = FakeClassroom(args.courses, args.per_course, args.latency)
+    main.current().service = fake
+    # The fake backend has no quota to protect; with the default token bucket
+    # this would measure the rate limit instead of the fan-out.
+    main.current().scheduler = QuotaScheduler(rate=0)
+    course_ids = [c["id"] for c in fake.courses_data]
+
+    print(f"{'limit':>6} {'wall (s)':>10} {'speedup':>8} {'tasks':>7}")
+    baseline = None
+    for limit in (int(x) for x in args.limits.split(",")):
+        start = time.perf_counter()
+        results = main.fetch_coursework(course_ids, max_in_flight=limit)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        tasks = sum(len(r.value) for r in results if r.ok)
+        print(f"{limit:>6} {elapsed:>10.3f} {baseline / elapsed:>7.1f}x {tasks:>7}")
+
+
+if __name__ == "__main__":
+    run()
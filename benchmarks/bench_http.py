@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Load test: many MCP clients served by one long-lived HTTP server.
+
+Starts ``fake_server.py --http`` (main.py on the fake backend) in a
+subprocess, then opens ``--clients`` concurrent MCP sessions that each run
+``--rounds`` of getCourses / get_tasks / query_tasks. Reports per-call
+latency, overall throughput and, from get_metrics, how many backend calls
+the whole load cost: with one shared store and in-flight deduplication it
+stays close to what a single client needs.
+
+With ``--compare-stdio`` the same load is also run the old way, each client
+spawning its own stdio server (and paying its own cold start).
+
+    python benchmarks/bench_http.py --clients 20 --rounds 5 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from fastmcp import Client
+
+HERE = Path(__file__).resolve().parent
+FAKE_SERVER = HERE / "fake_server.py"
+
+CALLS = [
+    ("getCourses", {}),
+    ("get_tasks", {}),
+    ("query_tasks", {"due_after": "2026-03-01", "due_before": "2026-03-31"}),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                if json.load(resp).get("service_ready"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"server not ready at {url}")
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))]
+
+
+async def run_client(target, rounds, latencies):
+    async with Client(target) as mcp:
+        for _ in range(rounds):
+            for name, args in CALLS:
+                start = time.perf_counter()
+                await mcp.call_tool(name, args)
+                latencies.append(time.perf_counter() - start)
+
+
+async def run_load(targets, rounds):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(t, rounds, latencies) for t in targets))
+    return time.perf_counter() - start, latencies
+
+
+def report(label, wall, latencies, backend_calls=None):
+    calls = f"{backend_calls:>9}" if backend_calls is not None else f"{'-':>9}"
+    print(
+        f"{label:<22} {wall:>8.2f} {len(latencies) / wall:>9.1f} "
+        f"{statistics.median(latencies) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} {calls}"
+    )
+
+
+async def backend_calls(url):
+    async with Client(url) as mcp:
+        result = await mcp.call_tool("get_metrics", {})
+    timings = json.loads(result.content[0].text)["timings"]
+    return sum(t["count"] for name, t in timings.items() if name.startswith("api."))
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--courses", type=int, default=40)
+    parser.add_argument("--per-course", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--compare-stdio", action="store_true")
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "FAKE_COURSES": str(args.courses),
+        "FAKE_PER_COURSE": str(args.per_course),
+        "FAKE_LATENCY": str(args.latency),
+    }
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, str(FAKE_SERVER), "--http", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}/mcp"
+    try:
+        wait_ready(f"http://127.0.0.1:{port}/health")
+        print(f"{args.clients} clients x {args.rounds} rounds x {len(CALLS)} calls, "
+              f"{args.courses} courses, {args.latency * 1000:.0f} ms per API call\n")
+        print(f"{'mode':<22} {'wall (s)':>8} {'calls/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'API calls':>9}")
+        wall, latencies = asyncio.run(run_load([url] * args.clients, args.rounds))
+        report("http (one server)", wall, latencies, asyncio.run(backend_calls(url)))
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.compare_stdio:
+        os.environ.update({k: env[k] for k in ("FAKE_COURSES", "FAKE_PER_COURSE", "FAKE_LATENCY")})
+        wall, latencies = asyncio.run(run_load([FAKE_SERVER] * args.clients, args.rounds))
+        report("stdio (one per client)", wall, latencies)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Memory and GC cost of the client's task cache: raw dicts versus records.
+
+For each size in ``--sizes`` decodes a get_tasks payload of synthetic
+coursework (the full resource with materials and links, and the default
+TASK_FIELDS projection) and holds it two ways: the decoded dicts tagged with
+``courseName``, as the client used to keep them, and records.TaskRecord
+built from them with the dicts dropped. Reports retained memory
+(tracemalloc), GC-tracked objects, the time of a full gc.collect() while the
+tasks are held and the time to build the records.
+
+Also checks that records feed the pipeline exactly as the dicts did: same
+packer summary, due priority, due-index windows and ranking, and ``raw``
+gives back the original resource.
+
+    python benchmarks/bench_memory.py --sizes 10000,100000
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deadlines import DueIndex  # noqa: E402
+from fake_classroom import FakeClassroom  # noqa: E402
+from packer import compact_task, due_priority  # noqa: E402
+from projection import TASK_FIELDS, project_all  # noqa: E402
+from ranking import TaskIndex  # noqa: E402
+from records import due_seconds, to_records  # noqa: E402
+
+COURSES = 40
+QUESTIONS = ["tarea 3", "lorem ipsum", "curso 7 tarea 12"]
+
+
+def payload(n, fields):
+    fake = FakeClassroom(n_courses=COURSES, coursework_per_course=max(1, n // COURSES), latency=0)
+    items = [item for c in fake.courses_data for item in fake.coursework[c["id"]]]
+    names = {c["id"]: c["name"] for c in fake.courses_data}
+    return json.dumps(project_all(items, fields), ensure_ascii=False), names
+
+
+def as_dicts(text, names):
+    tasks = json.loads(text)
+    for t in tasks:
+        t["courseName"] = names.get(str(t.get("courseId")))
+    return tasks
+
+
+def as_records(text, names):
+    return to_records(json.loads(text), names.get)
+
+
+def held(build, text, names):
+    """(tasks, retained bytes, GC-tracked objects, gc.collect seconds)."""
+    gc.collect()
+    objects = len(gc.get_objects())
+    tracemalloc.start()
+    tasks = build(text, names)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracked = len(gc.get_objects()) - objects
+    samples = []
+    for _ in range(3):
+        start = time.perf_counter()
+        gc.collect()
+        samples.append(time.perf_counter() - start)
+    return tasks, retained, tracked, statistics.median(samples)
+
+
+def same_pipeline(dicts, records):
+    """Names of the pipeline steps where records and dicts disagree."""
+    failed = []
+    originals = [{k: v for k, v in t.items() if k != "courseName"} for t in dicts]
+    if [r.raw for r in records] != originals:
+        failed.append("raw")
+    if [compact_task(t) for t in dicts] != [compact_task(r) for r in records]:
+        failed.append("compact_task")
+    priority = due_priority(datetime.date(2026, 3, 1))
+    if [priority(t) for t in dicts] != [priority(r) for r in records]:
+        failed.append("due_priority")
+    windows = [(None, datetime.date(2026, 3, 1)), (datetime.date(2026, 3, 2), datetime.date(2026, 3, 8))]
+    by_dict, by_record = DueIndex(dicts), DueIndex(records, due=due_seconds)
+    for start, end in windows:
+        if [t["id"] for t in by_dict.range(start, end)] != [r.id for r in by_record.range(start, end)]:
+            failed.append("due index")
+            break
+    index_dicts, index_records = TaskIndex(), TaskIndex()
+    for question in QUESTIONS:
+        ranked = [t["id"] for t in index_dicts.rank(question, dicts, k=40)]
+        if ranked != [r.id for r in index_records.rank(question, records, k=40)]:
+            failed.append("ranking")
+            break
+    return failed
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000")
+    args = parser.parse_args()
+
+    status = 0
+    print(f"{'tasks':>7} {'payload':<9} {'held as':<8} {'MB':>8} {'B/task':>7} {'gc objs':>9} "
+          f"{'gc ms':>7} {'build ms':>9}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        for label, fields in (("full", "*"), ("fields", TASK_FIELDS)):
+            text, names = payload(n, fields)
+            for held_as, build in (("dicts", as_dicts), ("records", as_records)):
+                start = time.perf_counter()
+                build(text, names)
+                elapsed = time.perf_counter() - start
+                # One way at a time, so neither pays for the other's objects.
+                tasks, retained, tracked, collect = held(build, text, names)
+                del tasks
+                print(f"{n:>7} {label:<9} {held_as:<8} {retained / 1e6:>8.1f} {retained / n:>7.0f} "
+                      f"{tracked:>9} {collect * 1000:>7.1f} {elapsed * 1000:>9.0f}")
+            failed = same_pipeline(as_dicts(text, names), as_records(text, names))
+            if failed:
+                print(f"  ❌ records differ from dicts in: {', '.join(failed)}")
+                status = 1
+
+    print("\n✅ records feed the pipeline like the dicts" if not status else "\n❌ records and dicts disagree")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(run())
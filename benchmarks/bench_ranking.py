@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Quality and speed of relevance ranking versus truncating the task list.
+
+Generates ``--tasks`` synthetic tasks across subjects, each about one topic
+(title and description mention it, amid generic school text; some also
+mention a related topic in passing), and runs the
+labeled questions in ranking_cases.jsonl. For each question the ``--k`` tasks
+sent to the model are chosen three ways: the first k as they arrive (plain
+truncation), the k due soonest (the packer's due-date priority) and the k
+ranked best by ranking.TaskIndex. Precision and recall are measured against
+the tasks of the question's topic.
+
+Also reports the time to index the tasks (in arrival-sized batches, as the
+client does), to rank a question over all of them and to re-index a batch
+of updated tasks.
+
+    python benchmarks/bench_ranking.py --tasks 10000 --k 40
+"""
+
+import argparse
+import datetime
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from packer import due_priority  # noqa: E402
+from ranking import TaskIndex  # noqa: E402
+
+CASES = Path(__file__).resolve().parent / "ranking_cases.jsonl"
+
+# subject -> {topic id: (title phrase, description sentence)}
+SUBJECTS = {
+    "Biología": {
+        "fotosintesis": ("La fotosíntesis", "Explica la fotosíntesis: clorofila, luz solar y glucosa."),
+        "celula": ("Partes de la célula", "Dibuja una célula animal y una vegetal con sus orgánulos."),
+        "genetica": ("Genética y ADN", "Resume la estructura del ADN y las leyes de Mendel de la genética."),
+        "ecosistemas": ("Ecosistemas", "Describe un ecosistema: cadenas tróficas, productores y consumidores."),
+    },
+    "Matemáticas": {
+        "fracciones": ("Fracciones", "Resuelve las operaciones con fracciones y simplifica el resultado."),
+        "ecuaciones": ("Ecuaciones de segundo grado", "Resuelve las ecuaciones de segundo grado con la fórmula general."),
+        "probabilidad": ("Probabilidad", "Calcula la probabilidad de cada suceso con dados y monedas."),
+        "geometria": ("Geometría: triángulos", "Halla el área y el perímetro de los triángulos de la geometría plana."),
+    },
+    "Historia": {
+        "revolucion_francesa": ("La Revolución Francesa", "Causas y consecuencias de la Revolución Francesa de 1789."),
+        "independencia": ("La independencia", "Línea de tiempo de la independencia y sus próceres."),
+        "guerra_mundial": ("Segunda Guerra Mundial", "Mapa de los frentes de la segunda guerra mundial."),
+    },
+    "Inglés": {
+        "essay": ("Essay: my summer", "Write an essay of 200 words about your summer holidays."),
+        "past_simple": ("Past simple", "Complete the past simple worksheet with regular and irregular verbs."),
+    },
+    "Química": {
+        "tabla_periodica": ("Tabla periódica", "Ubica los elementos en la tabla periódica por grupo y periodo."),
+        "reacciones": ("Reacciones químicas", "Balancea las reacciones químicas y clasifícalas."),
+        "enlaces": ("Enlaces químicos", "Compara los enlaces covalentes, iónicos y metálicos."),
+    },
+    "Física": {
+        "energia": ("Energía cinética y potencial", "Calcula la energía cinética y la energía potencial en cada caso."),
+        "newton": ("Leyes de Newton", "Aplica las tres leyes de Newton a los problemas de dinámica."),
+    },
+    "Informática": {
+        "programacion": ("Proyecto de programación", "Programa el juego en Python usando funciones y bucles."),
+        "bases_datos": ("Bases de datos", "Diseña el modelo de bases de datos y escribe las consultas SQL."),
+    },
+    "Lengua Española": {
+        "quijote": ("Comentario del Quijote", "Comentario de texto de un capítulo del Quijote de Cervantes."),
+        "ortografia": ("Ortografía", "Ejercicios de ortografía: acentuación, tildes y uso de la b y la v."),
+    },
+    "Geografía": {
+        "rios": ("Ríos de América", "Ubica en el mapa los principales ríos de América."),
+        "relieve": ("Clima y relieve de Europa", "Describe el clima y el relieve de Europa con un mapa físico."),
+    },
+}
+
+TEMPLATES = ["Tarea:", "Actividad", "Práctica", "Ejercicios", "Trabajo", "Guía", "Taller", "Repaso"]
+FILLER = [
+    "Entregar en formato PDF antes de la fecha indicada.",
+    "Se evaluará la presentación, la ortografía y la puntualidad.",
+    "Trabajo individual; consulta el material de la unidad.",
+    "Sube tus respuestas a Classroom y revisa la rúbrica adjunta.",
+    "Incluye portada con tu nombre y número de lista.",
+    "Puedes apoyarte en el libro de texto y en los apuntes de clase.",
+]
+
+
+def make_tasks(n, seed=0):
+    """n synthetic tasks in arrival order, each tagged with its topic."""
+    rng = random.Random(seed)
+    subjects = list(SUBJECTS)
+    base = datetime.date(2026, 1, 1)
+    tasks = []
+    for i in range(n):
+        subject = subjects[i % len(subjects)]
+        topics = list(SUBJECTS[subject].items())
+        topic, (title, sentence) = rng.choice(topics)
+        due = base + datetime.timedelta(days=rng.randrange(365))
+        # A third of the tasks also mention another topic they build on.
+        recap = [f"Repasa antes: {rng.choice(topics)[1][0]}."] if rng.random() < 0.3 else []
+        task = {
+            "id": str(i),
+            "courseId": str(100 + subjects.index(subject)),
+            "courseName": subject,
+            "title": f"{rng.choice(TEMPLATES)} {title} {i // len(subjects) + 1}",
+            "description": " ".join([sentence, *rng.sample(FILLER, 3), *recap]),
+            "updateTime": f"2026-01-01T00:00:{i % 60:02d}Z",
+            "topic": topic,
+        }
+        if rng.random() > 0.1:
+            task["dueDate"] = {"year": due.year, "month": due.month, "day": due.day}
+        tasks.append(task)
+    return tasks
+
+
+def load_cases():
+    with open(CASES, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def quality(selected, topic, relevant, k):
+    hits = sum(t["topic"] == topic for t in selected)
+    return hits / max(len(selected), 1), hits / min(k, relevant)
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--k", type=int, default=40)
+    parser.add_argument("--batch", type=int, default=200, help="tasks per arriving batch")
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks)
+    cases = load_cases()
+    by_topic = {}
+    for t in tasks:
+        by_topic[t["topic"]] = by_topic.get(t["topic"], 0) + 1
+
+    index = TaskIndex()
+    start = time.perf_counter()
+    for i in range(0, len(tasks), args.batch):
+        index.add_all(tasks[i:i + args.batch])
+    build = time.perf_counter() - start
+
+    today = datetime.date(2026, 3, 1)
+    by_due = sorted(tasks, key=due_priority(today))
+    strategies = {
+        "truncation": lambda question: tasks[:args.k],
+        "due date": lambda question: by_due[:args.k],
+        "bm25": lambda question: index.rank(question, by_due, args.k),
+    }
+
+    print(f"{len(tasks)} tasks, {len(cases)} labeled questions, top {args.k}\n")
+    print(f"{'selection':<12} {'precision':>10} {'recall':>8} {'p50 ms':>8} {'max ms':>8}")
+    results = {}
+    for name, select in strategies.items():
+        precision, recall, latencies = [], [], []
+        for case in cases:
+            start = time.perf_counter()
+            selected = select(case["text"])
+            latencies.append(time.perf_counter() - start)
+            p, r = quality(selected, case["topic"], by_topic.get(case["topic"], 0), args.k)
+            precision.append(p)
+            recall.append(r)
+        results[name] = statistics.mean(recall)
+        print(
+            f"{name:<12} {statistics.mean(precision):>10.1%} {statistics.mean(recall):>8.1%} "
+            f"{statistics.median(latencies) * 1000:>8.3f} {max(latencies) * 1000:>8.3f}"
+        )
+
+    top = [index.top(case["text"], args.k) for case in cases]
+    start = time.perf_counter()
+    for case in cases:
+        index.top(case["text"], args.k)
+    per_query = (time.perf_counter() - start) / len(cases)
+
+    updated = [{**t, "updateTime": "2026-02-01T00:00:00Z"} for t in tasks[:args.batch]]
+    start = time.perf_counter()
+    index.add_all(updated)
+    reindex = time.perf_counter() - start
+
+    print(f"\nindex {len(tasks)} tasks: {build * 1000:.0f} ms ({args.batch} per batch), "
+          f"top-{args.k} over the whole index: {per_query * 1000:.2f} ms/question, "
+          f"re-index {len(updated)} updated tasks: {reindex * 1000:.1f} ms")
+    misses = sum(not hits for hits in top)
+    ok = results["bm25"] > max(results["truncation"], results["due date"]) and not misses
+    print("✅ ranking beats truncation" if ok else "❌ ranking does not beat truncation")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run())
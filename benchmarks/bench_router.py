@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Accuracy and latency of the local intent router.
+
+Runs router.route over the labeled questions in router_cases.jsonl and
+reports coverage (share routed without the LLM), accuracy of those routed
+decisions and per-question latency. With --llm it also runs the current LLM
+classifier (client.classify_with_llm, needs GITHUB_TOKEN) over the same set
+and scores the combined pipeline: local when confident, LLM otherwise.
+
+    python benchmarks/bench_router.py [--llm]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from router import CLASSROOM, OTHER, route  # noqa: E402
+
+CASES = Path(__file__).resolve().parent / "router_cases.jsonl"
+
+
+def load_cases():
+    with open(CASES, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def timed(fn, text):
+    start = time.perf_counter()
+    result = fn(text)
+    return result, time.perf_counter() - start
+
+
+def summary(name, correct, total, latencies):
+    print(
+        f"{name:<10} accuracy {correct}/{total} ({correct / max(total, 1):.0%})"
+        f"   latency median {statistics.median(latencies) * 1000:.3f} ms"
+        f"   max {max(latencies) * 1000:.3f} ms"
+    )
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm", action="store_true", help="also run the LLM classifier")
+    args = parser.parse_args()
+
+    cases = load_cases()
+    local = [timed(route, c["text"]) for c in cases]
+    routed = [(c, r) for c, (r, _) in zip(cases, local) if r is not None]
+    correct = sum(r == c["label"] for c, r in routed)
+
+    print(f"{len(cases)} labeled questions, {len(routed)} routed locally ({len(routed) / len(cases):.0%})")
+    summary("local", correct, len(routed), [t for _, t in local])
+    for c, r in routed:
+        if r != c["label"]:
+            print(f"  ✗ {c['text']!r}: {r} (expected {c['label']})")
+
+    if not args.llm:
+        return
+
+    from client import classify_with_llm
+
+    async def llm_routes():
+        # One event loop for every case: client.ai is bound to the loop it
+        # first runs on.
+        results = []
+        for c in cases:
+            start = time.perf_counter()
+            answer = await classify_with_llm(c["text"])
+            route_ = CLASSROOM if "CALL_CLASSROOM" in answer.upper() else OTHER
+            results.append((route_, time.perf_counter() - start))
+        return results
+
+    llm = asyncio.run(llm_routes())
+    summary("llm", sum(r == c["label"] for c, (r, _) in zip(cases, llm)), len(cases), [t for _, t in llm])
+
+    combined = [(lr if lr is not None else mr, lt if lr is not None else lt + mt)
+                for (lr, lt), (mr, mt) in zip(local, llm)]
+    summary("combined", sum(r == c["label"] for c, (r, _) in zip(cases, combined)), len(cases),
+            [t for _, t in combined])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Backend hits when many tool calls overlap, with and without deduplication.
+
+Starts ``--callers`` threads that call the same tool at the same moment on a
+cold server (empty courses cache and store) backed by the fake backend, then
+counts the API calls that reached it. With in-flight deduplication,
+identical requests issued while one is pending share its result, and a
+course already being synced by one call is waited for by the others, so the
+count stays close to a single caller's.
+
+    python benchmarks/bench_singleflight.py --callers 8 --latency 0.05
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("CLASSROOM_STORE", ":memory:")
+
+import main  # noqa: E402
+from fake_classroom import FakeClassroom  # noqa: E402
+from fetching import SingleFlight  # noqa: E402
+from scheduler import QuotaScheduler  # noqa: E402
+
+
+class NoDedup:
+    """Stand-in for SingleFlight that lets every call through."""
+
+    shared = 0
+
+    def do(self, key, fn):
+        return fn()
+
+    def claim(self, keys):
+        return list(keys), {}
+
+    def finish(self, key, result=None, error=None):
+        pass
+
+
+SCENARIOS = {
+    "getCourses": lambda: main.getCourses(),
+    "get_tasks": lambda: main.get_tasks(),
+    "getClases(1 course)": lambda: main.getClases({"id": "1000"}),
+}
+
+
+def run_scenario(fake, tool, callers, dedup):
+    account = main.current()
+    account.reset()
+    account.service = fake
+    account.inflight = SingleFlight() if dedup else NoDedup()
+    account.syncing = SingleFlight() if dedup else NoDedup()
+    # No rate limit, so wall times compare round trips rather than quota.
+    account.scheduler = QuotaScheduler(rate=0)
+    fake.reset_calls()
+
+    barrier = threading.Barrier(callers)
+    errors = []
+
+    def caller():
+        barrier.wait()
+        try:
+            tool()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(callers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    shared = account.inflight.shared + account.syncing.shared
+    return sum(fake.calls.values()), shared, elapsed, errors
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=8)
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--per-course", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    fake = FakeClassroom(args.courses, args.per_course, args.latency)
+    print(f"{args.callers} concurrent callers, {args.courses} courses, {args.latency * 1000:.0f} ms per call")
+    print(f"{'tool':<22} {'single':>7} {'no dedup':>9} {'dedup':>7} {'shared':>7} {'wall (s)':>9}")
+    status = 0
+    for name, tool in SCENARIOS.items():
+        single, _, _, _ = run_scenario(fake, tool, 1, dedup=True)
+        naive, _, _, _ = run_scenario(fake, tool, args.callers, dedup=False)
+        hits, shared, elapsed, errors = run_scenario(fake, tool, args.callers, dedup=True)
+        print(f"{name:<22} {single:>7} {naive:>9} {hits:>7} {shared:>7} {elapsed:>9.3f}")
+        if errors:
+            print(f"  ❌ {len(errors)} callers failed: {errors[0]!r}")
+            status = 1
+        elif hits > single:
+            print(f"  ❌ {hits - single} duplicate backend calls")
+            status = 1
+    if not status:
+        print("✅ concurrent callers cost no more backend calls than one")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(run())
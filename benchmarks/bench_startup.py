@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Cold-start cost of the MCP server.
+
+Reports, over several runs:
+  - import time of main.py in a fresh interpreter (what `--authorize` and
+    every spawned server pay before doing anything),
+  - time to a ready service in a fresh interpreter: ensure_service(), i.e.
+    auth() from the token file plus build_service() with the discovery
+    document bundled with googleapiclient (and the Google imports it pulls
+    in), and
+  - time to first tool response: spawning the real `main.py` stdio server
+    (serve(), the background warm_up, the MCP handshake) and one getCourses
+    call, as the client does per session.
+
+No Google account or network is needed: the token file holds dummy
+credentials that never expire, and the store is pre-synced so getCourses is
+answered from it without calling the API.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fake_classroom import FakeClassroom  # noqa: E402
+from store import CourseworkStore  # noqa: E402
+
+
+def make_account(directory: Path):
+    """Dummy token.json and a store whose course list was just synced."""
+    token = {
+        "token": "dummy-access-token",
+        "refresh_token": "dummy-refresh-token",
+        "client_id": "dummy.apps.googleusercontent.com",
+        "client_secret": "dummy",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "expiry": "2999-01-01T00:00:00Z",
+    }
+    (directory / "token.json").write_text(json.dumps(token))
+    st = CourseworkStore(str(directory / "store.db"))
+    st.upsert_courses(FakeClassroom(latency=0).courses_data)
+    st.close()
+
+
+def environment(directory: Path) -> dict:
+    return {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "CLASSROOM_STORE": str(directory / "store.db"),
+        "CLASSROOM_STORE_MAX_AGE": "86400",
+    }
+
+
+def timed_subprocess(code: str, directory: Path) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=directory, env=environment(directory),
+        capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def import_time(directory: Path) -> float:
+    return timed_subprocess(
+        "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)", directory
+    )
+
+
+def service_time(directory: Path) -> float:
+    return timed_subprocess(
+        "import time, main; t = time.perf_counter(); main.ensure_service(); "
+        "print(time.perf_counter() - t)",
+        directory,
+    )
+
+
+async def first_tool_response(directory: Path) -> float:
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+
+    transport = StdioTransport(
+        sys.executable, [str(ROOT / "main.py")], env=environment(directory), cwd=str(directory),
+        log_file=directory / "server.log",
+    )
+    start = time.perf_counter()
+    async with Client(transport) as client:
+        result = await client.call_tool("getCourses", {})
+    elapsed = time.perf_counter() - start
+    if not json.loads(result.content[0].text):
+        raise RuntimeError("getCourses returned no courses")
+    return elapsed
+
+
+def report(name, samples):
+    print(
+        f"{name:<26} min {min(samples) * 1000:8.1f} ms"
+        f"   median {statistics.median(samples) * 1000:8.1f} ms"
+        f"   max {max(samples) * 1000:8.1f} ms"
+    )
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        make_account(directory)
+        report("import main", [import_time(directory) for _ in range(args.runs)])
+        report("auth + build_service", [service_time(directory) for _ in range(args.runs)])
+        report(
+            "first tool response",
+            [asyncio.run(first_tool_response(directory)) for _ in range(args.runs)],
+        )
+
+
+if __name__ == "__main__":
+    run()
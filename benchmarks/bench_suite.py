@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Offline benchmark suite for the MCP tools and the client pipeline.
+
+Runs main.py's tools in-process against the synthetic FakeClassroom
+backend and reports, per scenario: throughput, p50/p99 latency, peak
+memory, API calls per run and result size. Results can be written as JSON
+to compare runs.
+
+Scenarios run "cold" (fresh local store, so every run syncs everything) and
+"warm" (store already synced, as in steady state).
+
+    python benchmarks/bench_suite.py --courses 40 --per-course 50 \\
+        --latency 0.02 --runs 20 --json results.json
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+from fake_classroom import FakeClassroom  # noqa: E402
+from matcher import matcher_for  # noqa: E402
+from packer import PayloadPacker, due_priority  # noqa: E402
+from records import to_records  # noqa: E402
+from router import route  # noqa: E402
+from scheduler import QuotaScheduler  # noqa: E402
+
+try:
+    from toon_python import encode
+    ENCODER = "toon"
+except ImportError:  # the suite still measures everything else without it
+    def encode(obj):
+        return json.dumps(obj, ensure_ascii=False)
+    ENCODER = "json"
+
+QUESTION = "¿Qué tareas tengo en Curso 3?"
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def reset_store():
+    main.current().reset()
+
+
+def client_pipeline():
+    """What client.py does around an answer, minus the LLM: route, fetch,
+    decode the MCP payload, match the course, build named records and pack."""
+    route(QUESTION)
+    courses = json.loads(json.dumps(main.getCourses()))
+    by_id = {str(c["id"]): c for c in courses}
+    matched = matcher_for(courses).match(QUESTION)
+    tasks = to_records(
+        json.loads(json.dumps(main.getClases(matched) if matched else main.get_tasks())),
+        lambda cid: by_id.get(cid, {}).get("name"),
+    )
+    return PayloadPacker(encode).pack(tasks, priority=due_priority())[0]
+
+
+def revalidation():
+    """get_tasks with if_version, the way the client revalidates its cache."""
+    state = {"version": ""}
+
+    def call():
+        result = main.get_tasks({"if_version": state["version"]})
+        state["version"] = result["version"]
+        return result
+
+    return call
+
+
+def scenarios(fake):
+    first = fake.courses_data[:1]
+    today = datetime.date(2026, 3, 1)
+    return {
+        "getCourses": lambda: main.getCourses(),
+        "getClases(1 course)": lambda: main.getClases(first),
+        "getClases(all)": lambda: main.getClases(fake.courses_data),
+        "get_tasks": lambda: main.get_tasks(),
+        "get_tasks(if_version)": revalidation(),
+        "query_tasks(week)": lambda: main.query_tasks(
+            due_after=today.isoformat(), due_before=(today + datetime.timedelta(days=6)).isoformat()
+        ),
+        "get_pending_tasks": lambda: main.get_pending_tasks(),
+        "client pipeline": client_pipeline,
+    }
+
+
+def measure(name, fn, fake, runs, cold):
+    latencies, calls, size = [], 0, 0
+    for _ in range(runs):
+        if cold:
+            reset_store()
+        fake.reset_calls()
+        start = time.perf_counter()
+        result = fn()
+        latencies.append(time.perf_counter() - start)
+        calls += sum(fake.calls.values())
+        size = len(result) if isinstance(result, str) else len(json.dumps(result, ensure_ascii=False))
+
+    # Peak memory from one extra run, traced separately so tracing overhead
+    # does not skew the latencies.
+    if cold:
+        reset_store()
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(latencies)
+    return {
+        "scenario": name,
+        "mode": "cold" if cold else "warm",
+        "runs": runs,
+        "throughput_per_s": runs / total if total else float("inf"),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "peak_mem_kb": peak / 1024,
+        "api_calls_per_run": calls / runs,
+        "result_bytes": size,
+    }
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=40)
+    parser.add_argument("--per-course", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=main.COURSEWORK_PAGE_SIZE,
+                        help="courseWork page size requested by main.py")
+    parser.add_argument("--max-page-size", type=int, default=None,
+                        help="page size cap enforced by the fake backend")
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per API call")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--mode", choices=("cold", "warm", "both"), default="both")
+    parser.add_argument("--only", help="comma-separated scenario names to run")
+    parser.add_argument("--json", help="write machine-readable results to this file")
+    args = parser.parse_args()
+
+    fake = FakeClassroom(args.courses, args.per_course, args.latency, args.max_page_size)
+    account = main.current()
+    account.service = fake
+    account.store_path = ":memory:"
+    # Measure the code, not the quota: the fake backend never throttles.
+    account.scheduler = QuotaScheduler(rate=0)
+    main.COURSEWORK_PAGE_SIZE = args.page_size
+    reset_store()
+
+    selected = scenarios(fake)
+    if args.only:
+        wanted = {name.strip() for name in args.only.split(",")}
+        selected = {k: v for k, v in selected.items() if k in wanted}
+
+    modes = {"cold": [True], "warm": [False], "both": [True, False]}[args.mode]
+    results = []
+    for cold in modes:
+        if not cold:
+            reset_store()
+            main.get_tasks()  # sync once; later runs are served from the store
+        for name, fn in selected.items():
+            results.append(measure(name, fn, fake, args.runs, cold))
+
+    print(f"{'scenario':<22} {'mode':<5} {'ops/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+          f"{'peak KB':>9} {'calls':>7} {'bytes':>10}")
+    for r in results:
+        print(f"{r['scenario']:<22} {r['mode']:<5} {r['throughput_per_s']:>9.1f} {r['p50_ms']:>9.2f} "
+              f"{r['p99_ms']:>9.2f} {r['peak_mem_kb']:>9.0f} {r['api_calls_per_run']:>7.1f} "
+              f"{r['result_bytes']:>10}")
+
+    if args.json:
+        report = {
+            "config": {**vars(args), "encoder": ENCODER},
+            "environment": {"python": platform.python_version(), "platform": platform.platform()},
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Offline check of the batched coursework path.
+
+Builds the real Classroom service from googleapiclient's bundled discovery
+document on top of an ``HttpMockSequence`` that replays canned multipart
+batch responses, then runs main.fetch_coursework in batch mode and compares
+it with what each course should contain (including a follow-up page).
+
+    python benchmarks/check_batch.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from googleapiclient.discovery import build  # noqa: E402
+from googleapiclient.http import HttpMockSequence  # noqa: E402
+
+import main  # noqa: E402
+
+BOUNDARY = "batch_boundary"
+
+
+def batch_response(parts):
+    """Encode ``{request_id: (status, body)}`` as a multipart batch response."""
+    chunks = []
+    for request_id, (status, body) in parts.items():
+        payload = json.dumps(body)
+        chunks.append(
+            f"--{BOUNDARY}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <response-canned + {request_id}>\r\n\r\n"
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n"
+            f"{payload}\r\n"
+        )
+    content = "".join(chunks) + f"--{BOUNDARY}--"
+    headers = {"status": "200", "content-type": f"multipart/mixed; boundary={BOUNDARY}"}
+    return headers, content
+
+
+def run():
+    http = HttpMockSequence([
+        # Round 1: three courses in one batch; course "b" has a second page
+        # and course "c" fails.
+        batch_response({
+            "0": (200, {"courseWork": [{"id": "a1"}, {"id": "a2"}]}),
+            "1": (200, {"courseWork": [{"id": "b1"}], "nextPageToken": "p2"}),
+            "2": (404, {"error": {"code": 404, "message": "not found"}}),
+        }),
+        # Round 2: the follow-up page for course "b".
+        batch_response({"0": (200, {"courseWork": [{"id": "b2"}]})}),
+    ])
+    main.current().service = build("classroom", "v1", http=http, static_discovery=True)
+
+    results = main.fetch_coursework(["a", "b", "c"], mode="batch")
+    got = {r.key: [t["id"] for t in r.value] if r.ok else "error" for r in results}
+    expected = {"a": ["a1", "a2"], "b": ["b1", "b2"], "c": "error"}
+
+    print(json.dumps(got))
+    if got != expected:
+        print(f"❌ expected {json.dumps(expected)}")
+        return 1
+    print("✅ batch responses demultiplexed correctly")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Offline check of the quota scheduler against a throttling fake backend.
+
+The fake account answers 429 (with Retry-After) once more than ``--quota``
+calls arrive within a second and, optionally, random 503s. Coursework for
+every course is fetched three ways: without the scheduler (every throttled
+course is lost), with retries but no rate limit, and with the token bucket
+sized to the quota. The last two must not lose any data; the bucket also
+keeps most calls from being throttled in the first place, which is what
+keeps a real account clear of longer quota lockouts.
+
+    python benchmarks/check_quota.py --courses 60 --quota 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+from fake_classroom import FakeClassroom  # noqa: E402
+from scheduler import QuotaScheduler  # noqa: E402
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=60)
+    parser.add_argument("--per-course", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--quota", type=int, default=20, help="calls per second the fake allows")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="probability of a 503")
+    args = parser.parse_args()
+
+    scenarios = [
+        ("no scheduler", QuotaScheduler(rate=0, max_retries=0)),
+        ("retries only", QuotaScheduler(rate=0, base_delay=0.1)),
+        ("token bucket", QuotaScheduler(rate=args.quota, burst=args.quota, base_delay=0.1)),
+    ]
+
+    print(f"{'scenario':<14} {'wall (s)':>9} {'courses ok':>11} {'tasks':>7} {'429s':>6} {'503s':>6} {'calls/s':>8}")
+    status = 0
+    for name, scheduler in scenarios:
+        fake = FakeClassroom(
+            args.courses, args.per_course, args.latency,
+            quota=args.quota, retry_after="0.5", error_rate=args.error_rate,
+        )
+        account = main.current()
+        account.service = fake
+        account.scheduler = scheduler
+        course_ids = [c["id"] for c in fake.courses_data]
+
+        start = time.perf_counter()
+        results = main.fetch_coursework(course_ids, max_in_flight=16)
+        elapsed = time.perf_counter() - start
+
+        ok = sum(r.ok for r in results)
+        tasks = sum(len(r.value) for r in results if r.ok)
+        calls = sum(fake.calls.values())
+        print(
+            f"{name:<14} {elapsed:>9.2f} {ok:>5}/{len(results):<5} {tasks:>7} "
+            f"{fake.throttled:>6} {fake.failed:>6} {calls / elapsed:>8.1f}"
+        )
+        if name != "no scheduler" and ok != len(results):
+            status = 1
+
+    print("✅ no coursework lost with the scheduler" if not status else "❌ coursework lost")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(run())
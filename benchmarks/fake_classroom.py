@@ -0,0 +1,224 @@
+"""In-process stand-in for the Classroom API service object.
+
+Mimics the small slice of ``googleapiclient`` that main.py uses
+(``service.courses().list(...)``, ``service.courses().courseWork().list(...)``
+and ``request.execute()``, including paging, ``orderBy`` and ``fields``
+projections) and sleeps ``latency`` seconds per call so
+benchmarks can measure round-trip behaviour without network access.
+With ``quota`` set it also throttles like the real per-user quota, answering
+429 with a Retry-After header, and ``error_rate`` injects random 503s.
+"""
+
+import datetime
+import random
+import threading
+import time
+from collections import deque
+
+from projection import project
+
+
+class FakeRequest:
+    def __init__(self, backend, method_id, params, handler):
+        self.backend = backend
+        self.methodId = method_id
+        self.params = params
+        self.uri = f"fake://{method_id}?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        self._handler = handler
+
+    def execute(self, http=None, num_retries=0):
+        self.backend.admit(self.uri)
+        self.backend.record(self.methodId)
+        if self.backend.latency:
+            time.sleep(self.backend.latency)
+        return self._handler(**self.params)
+
+
+class _Submissions:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def list(self, **params):
+        return FakeRequest(
+            self.backend,
+            "classroom.courses.courseWork.studentSubmissions.list",
+            params,
+            self.backend.list_submissions,
+        )
+
+
+class _CourseWork:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def list(self, **params):
+        return FakeRequest(self.backend, "classroom.courses.courseWork.list", params, self.backend.list_coursework)
+
+    def studentSubmissions(self):
+        return _Submissions(self.backend)
+
+
+class _Courses:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def list(self, **params):
+        return FakeRequest(self.backend, "classroom.courses.list", params, self.backend.list_courses)
+
+    def courseWork(self):
+        return _CourseWork(self.backend)
+
+
+class FakeClassroom:
+    """Synthetic Classroom account with ``n_courses`` x ``coursework_per_course`` items.
+
+    Coursework carries realistic weight (description, materials, links) and
+    spread-out due dates and update times. ``max_page_size`` caps pages the
+    way the real API does regardless of the requested pageSize.
+    ``quota`` allows that many calls per second (sliding window); calls over
+    it fail with HTTP 429 and ``Retry-After: retry_after``. ``error_rate`` is
+    the probability of a transient 503 on any call.
+    """
+
+    def __init__(
+        self,
+        n_courses=40,
+        coursework_per_course=20,
+        latency=0.05,
+        max_page_size=None,
+        quota=None,
+        retry_after="1",
+        error_rate=0.0,
+        seed=0,
+    ):
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.quota = quota
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._window = deque()
+        self.throttled = 0
+        self.failed = 0
+        base = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+        self.courses_data = [
+            {
+                "id": str(1000 + i),
+                "name": f"Curso {i}",
+                "section": f"Sección {i % 4}",
+                "ownerId": str(9000 + i % 7),
+                "courseState": "ACTIVE" if i % 10 else "ARCHIVED",
+                "updateTime": (base + datetime.timedelta(days=i)).isoformat().replace("+00:00", "Z"),
+                "alternateLink": f"https://classroom.google.com/c/{1000 + i}",
+            }
+            for i in range(n_courses)
+        ]
+        self.coursework = {}
+        for i, c in enumerate(self.courses_data):
+            work = []
+            for j in range(coursework_per_course):
+                due = base + datetime.timedelta(days=(i * 7 + j * 3) % 365)
+                item = {
+                    "id": f"{c['id']}-{j}",
+                    "courseId": c["id"],
+                    "title": f"Tarea {j} de {c['name']}",
+                    "description": "Lorem ipsum dolor sit amet " * 8,
+                    "workType": "ASSIGNMENT" if j % 4 else "SHORT_ANSWER_QUESTION",
+                    "state": "PUBLISHED",
+                    "alternateLink": f"https://classroom.google.com/c/{c['id']}/a/{j}",
+                    "creationTime": (base + datetime.timedelta(hours=j)).isoformat().replace("+00:00", "Z"),
+                    "updateTime": (base + datetime.timedelta(hours=j, minutes=i)).isoformat().replace("+00:00", "Z"),
+                    "maxPoints": 100,
+                    "assigneeMode": "ALL_STUDENTS",
+                    "materials": [
+                        {"link": {"url": f"https://example.com/{c['id']}/{j}/{k}", "title": f"Material {k}"}}
+                        for k in range(3)
+                    ],
+                }
+                if j % 6:
+                    item["dueDate"] = {"year": due.year, "month": due.month, "day": due.day}
+                    item["dueTime"] = {"hours": 23, "minutes": 59}
+                work.append(item)
+            self.coursework[c["id"]] = work
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def record(self, method_id):
+        with self._lock:
+            self.calls[method_id] = self.calls.get(method_id, 0) + 1
+
+    def reset_calls(self):
+        with self._lock:
+            self.calls = {}
+            self.throttled = 0
+            self.failed = 0
+
+    def admit(self, uri):
+        """Raise the HttpError the real API would when over quota or failing."""
+        if not self.quota and not self.error_rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            while self._window and now - self._window[0] >= 1.0:
+                self._window.popleft()
+            if self.quota and len(self._window) >= self.quota:
+                self.throttled += 1
+                status, headers, message = 429, {"retry-after": self.retry_after}, "Quota exceeded"
+            elif self.error_rate and self._random.random() < self.error_rate:
+                self.failed += 1
+                status, headers, message = 503, {}, "Backend unavailable"
+            else:
+                self._window.append(now)
+                return
+
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        resp = httplib2.Response({"status": status, **headers})
+        raise HttpError(resp, f'{{"error": {{"code": {status}, "message": "{message}"}}}}'.encode(), uri=uri)
+
+    def courses(self):
+        return _Courses(self)
+
+    def _page(self, items_key, items, pageSize=None, pageToken=None, orderBy=None, fields=None, **params):
+        if self.max_page_size:
+            pageSize = min(pageSize or self.max_page_size, self.max_page_size)
+        if orderBy:
+            field, _, direction = orderBy.partition(" ")
+            items = sorted(items, key=lambda i: str(i.get(field) or ""), reverse=direction != "asc")
+        start = int(pageToken or 0)
+        end = start + pageSize if pageSize else len(items)
+        resp = {items_key: items[start:end]}
+        if end < len(items):
+            resp["nextPageToken"] = str(end)
+        return project(resp, fields)
+
+    def list_courses(self, **params):
+        return self._page("courses", self.courses_data, **params)
+
+    # Every third task is turned in, every fifth pending one is late.
+    SUBMISSION_STATES = ("CREATED", "TURNED_IN", "NEW")
+
+    def list_submissions(self, courseId, courseWorkId, userId="me", **params):
+        if courseId not in self.coursework:
+            raise LookupError(f"course {courseId} not found")
+        work = self.coursework[courseId]
+        if courseWorkId != "-":
+            work = [w for w in work if w["id"] == courseWorkId]
+        submissions = [
+            {
+                "id": f"sub-{w['id']}",
+                "courseId": courseId,
+                "courseWorkId": w["id"],
+                "userId": userId,
+                "state": self.SUBMISSION_STATES[j % 3],
+                "late": j % 5 == 0 and j % 3 != 1,
+            }
+            for j, w in enumerate(work)
+        ]
+        return self._page("studentSubmissions", submissions, **params)
+
+    def list_coursework(self, courseId, **params):
+        if courseId not in self.coursework:
+            raise LookupError(f"course {courseId} not found")
+        return self._page("courseWork", self.coursework[courseId], **params)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Run main.py's MCP server on top of the in-process fake backend.
+
+Used by the benchmarks in place of ``main.py`` so no Google account or token
+is needed. The fake account is sized through environment variables:
+FAKE_COURSES, FAKE_PER_COURSE and FAKE_LATENCY (seconds per API call).
+With ``--http [--port N]`` it runs as a long-lived HTTP server instead.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("CLASSROOM_STORE", ":memory:")
+
+import main  # noqa: E402
+from fake_classroom import FakeClassroom  # noqa: E402
+from scheduler import QuotaScheduler  # noqa: E402
+
+main.current().service = FakeClassroom(
+    n_courses=int(os.environ.get("FAKE_COURSES", "40")),
+    coursework_per_course=int(os.environ.get("FAKE_PER_COURSE", "20")),
+    latency=float(os.environ.get("FAKE_LATENCY", "0")),
+)
+# The fake backend has no quota to protect.
+main.current().scheduler = QuotaScheduler(rate=0)
+
+if __name__ == "__main__":
+    if "--http" in sys.argv:
+        main.serve("http", port=int(main._arg("--port", main.HTTP_PORT)))
+    else:
+        main.create_server().run(transport="stdio", show_banner=False)
@@ -0,0 +1,106 @@
+"""Bounded async cache with per-entry TTL and stale-while-revalidate.
+
+Used by the chat client for the courses and tasks it gets from the MCP
+server. Entries younger than ``ttl`` are served as-is. Entries up to
+``ttl + stale_ttl`` old are served immediately while one background task
+reloads them. Anything older, or missing, is loaded before returning. The
+least recently used entry is evicted once ``maxsize`` is exceeded.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class TTLCache:
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0, stale_ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # How long past its TTL an entry may still be served while refreshing.
+        self.stale_ttl = ttl * 10 if stale_ttl is None else stale_ttl
+        self._data: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "evictions": self.evictions,
+        }
+
+    def set(self, key, value):
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def peek(self, key, default=None):
+        """Cached value regardless of age, without touching stats or LRU order."""
+        entry = self._data.get(key)
+        return entry[0] if entry else default
+
+    def invalidate(self, key=None):
+        """Drop one entry, or everything when key is None."""
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def _load(self, key, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start (or join) the single in-flight load for a key."""
+        task = self._loading.get(key)
+        if task is None:
+            async def run():
+                try:
+                    value = await loader()
+                    self.set(key, value)
+                    return value
+                finally:
+                    self._loading.pop(key, None)
+
+            task = self._loading[key] = asyncio.ensure_future(run())
+        return task
+
+    async def get(self, key, loader: Callable[[], Awaitable[Any]]):
+        """Return the value for key, loading or revalidating it as needed."""
+        entry = self._data.get(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._data.move_to_end(key)
+                if key not in self._loading:
+                    self.refreshes += 1
+                    self._load(key, loader).add_done_callback(self._refresh_done)
+                return value
+
+        self.misses += 1
+        return await self._load(key, loader)
+
+    def _refresh_done(self, task: asyncio.Task):
+        if task.cancelled() or task.exception() is not None:
+            self.refresh_errors += 1
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 import asyncio
 import json
+import os
 from fastmcp import Client
 
+# main.py por stdio, o un servidor `main.py --http` ya en marcha
+MCP_SERVER = os.environ.get("CLASSROOM_MCP_URL", "main.py")
+
 async def check():
     print("🔍 Verificando cursos y tareas...\n")
     
-    mcp = Client("main.py")
+    mcp = Client(MCP_SERVER)
     
     async with mcp:
         # 1. Obtener cursos
@@ -1,20 +1,32 @@
 import asyncio
 import os
+import sys
+import time
 import dotenv
 import json
 
 from fastmcp import Client
-from openai import OpenAI
+from openai import AsyncOpenAI
 from toon_python import encode
 
+from cache import TTLCache
+from deadlines import DueIndex
+from matcher import matcher_for
+from packer import PayloadPacker, due_priority, estimate_tokens
+from query import time_window
+from ranking import TaskIndex
+from records import due_seconds, to_records
+from router import CLASSROOM, normalize, route
+
 dotenv.load_dotenv()
 
 # Token de GitHub
 token = os.environ["GITHUB_TOKEN"]
 endpoint = "https://models.github.ai/inference"
 
-# Cliente IA (GitHub Models)
-ai = OpenAI(
+# Cliente IA (GitHub Models). Asíncrono para no bloquear la sesión MCP
+# mientras la IA responde.
+ai = AsyncOpenAI(
     base_url=endpoint,
     api_key=token,
 )
@@ -40,44 +52,95 @@ Usuario: "Qué tiempo hace hoy?" → Respuesta normal
 Usuario: "Hola, cómo estás?" → Respuesta normal
 """
 
-# Caché global de cursos y tareas
-COURSES_CACHE = {}
-TASKS_BY_COURSE = {}
+CALL_CLASSROOM = "CALL_CLASSROOM"
+
+# Servidor MCP: por defecto se lanza main.py por stdio; con CLASSROOM_MCP_URL
+# (p. ej. http://127.0.0.1:8000/mcp, ver `python main.py --http`) se usa un
+# servidor ya en marcha, con la sesión de Google y la caché ya calientes.
+MCP_SERVER = os.environ.get("CLASSROOM_MCP_URL", "main.py")
+
+async def stream_completion(messages, echo=True, **kwargs) -> str:
+    """Pide una respuesta en streaming, imprimiendo los tokens según llegan.
+
+    Con echo="auto" se retiene el texto mientras pueda ser CALL_CLASSROOM,
+    así las respuestas normales se muestran en cuanto se sabe que no lo son.
+    Devuelve el texto completo.
+    """
+    stream = await ai.chat.completions.create(
+        model="openai/gpt-4.1-mini",
+        messages=messages,
+        stream=True,
+        **kwargs,
+    )
+    answer = ""
+    printing = echo is True
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+        answer += delta
+        if printing:
+            print(delta, end="", flush=True)
+        elif echo == "auto":
+            head = answer.lstrip().upper()
+            if not (CALL_CLASSROOM.startswith(head) or head.startswith(CALL_CLASSROOM)):
+                printing = True
+                print(answer.lstrip(), end="", flush=True)
+    if echo == "auto" and not printing and CALL_CLASSROOM not in answer.upper():
+        printing = True
+        print(answer.strip(), end="")
+    if printing:
+        print()
+    return answer.strip()
+
+async def classify_with_llm(user_input: str, echo=False) -> str:
+    """Pregunta a la IA si hace falta Classroom; devuelve su respuesta.
+
+    Con echo=True las respuestas normales se imprimen en streaming.
+    """
+    return await stream_completion(
+        [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_input},
+        ],
+        echo="auto" if echo else False,
+        temperature=0.1,
+    )
+
+# Caché global de cursos y tareas: cada entrada vence tras su TTL, el tamaño
+# está acotado (LRU) y lo vencido se sirve al instante mientras se refresca
+# en segundo plano por la sesión MCP (stale-while-revalidate). Cada entrada
+# guarda (versión, datos): al refrescar se manda if_version y, si nada
+# cambió, el servidor solo contesta "notModified". Las tareas se guardan como
+# registros compactos (records.TaskRecord) con el nombre del curso ya puesto,
+# no como los dicts completos que manda el servidor.
+COURSES_CACHE = TTLCache(maxsize=1, ttl=float(os.environ.get("CLIENT_COURSES_TTL", "900")))
+TASKS_BY_COURSE = TTLCache(
+    maxsize=int(os.environ.get("CLIENT_TASKS_MAXSIZE", "64")),
+    ttl=float(os.environ.get("CLIENT_TASKS_TTL", "120")),
+)
+ALL_TASKS = "*"
+
+# Empaquetador de tareas para la IA (guarda cada fragmento TOON ya codificado)
+PACKER = PayloadPacker(encode)
+
+# Índice de relevancia (BM25) de las tareas ya vistas, alimentado según
+# llegan: si la pregunta nombra temas concretos solo se mandan a la IA las
+# RANK_TOP_K tareas que mejor le corresponden (ver ranking.py)
+TASK_INDEX = TaskIndex()
+RANK_TOP_K = int(os.environ.get("CLIENT_RANK_TOP_K", "40"))
+
+# Tareas ya vistas ordenadas por fecha de entrega (ver deadlines.py): con
+# todas las tareas en caché, "qué hay esta semana" se responde aquí mismo
+DUE_INDEX = DueIndex(due=due_seconds)
+
+def course_namer(courses: dict):
+    """courseId -> nombre del curso, para los registros de tareas"""
+    return lambda cid: courses.get(cid, {}).get('name', f'Curso {cid}')
 
 def find_course_by_name(query: str, courses_dict: dict) -> list:
-    """Busca cursos por nombre (fuzzy match)"""
-    query = query.lower().strip()
-    matches = []
-    
-    for course_id, course_info in courses_dict.items():
-        course_name = course_info.get('name', '').lower()
-        
-        # Exact match
-        if query == course_name:
-            return [course_id]
-        
-        # Contains match
-        if query in course_name or course_name in query:
-            matches.append(course_id)
-    
-    # También buscar por palabras clave
-    keywords = {
-        'ingles': ['english', 'inglés', 'ingles'],
-        'español': ['español', 'espanol', 'lengua española', 'lengua'],
-        'matematicas': ['matemáticas', 'matematicas', 'math'],
-        'ciencias': ['ciencias sociales', 'ciencias', 'sociales'],
-        'informatica': ['informática', 'informatica', 'tecnología', 'tecnologia'],
-    }
-    
-    for key, terms in keywords.items():
-        if any(term in query for term in terms):
-            for course_id, course_info in courses_dict.items():
-                course_name = course_info.get('name', '').lower()
-                if any(term in course_name for term in terms):
-                    if course_id not in matches:
-                        matches.append(course_id)
-    
-    return matches
+    """Busca cursos mencionados en la pregunta (ver matcher.CourseMatcher)"""
+    return [str(c.get('id')) for c in matcher_for(courses_dict.values()).match(query)]
 
 # Unwrap function - definida antes para usarla múltiples veces
 def unwrap_tool_result(obj):
@@ -134,14 +197,323 @@ def unwrap_tool_result(obj):
     except Exception:
         return [str(obj)]
 
+async def revalidate(cache, key, call):
+    """Pide datos al servidor con if_version según lo que ya hay en caché.
+
+    call(if_version) llama a la tool; devuelve (versión, datos), reutilizando
+    los datos guardados si el servidor contesta "notModified".
+    """
+    cached = cache.peek(key)
+    result = unwrap_tool_result(await call(cached[0] if cached else ""))
+    if isinstance(result, dict) and "version" in result:
+        if result.get("notModified") and cached:
+            return cached
+        return result["version"], result.get("items")
+    return "", result
+
+async def load_courses(mcp) -> dict:
+    """Cursos del usuario por id, desde COURSES_CACHE o el servidor"""
+    async def fetch():
+        version, courses_data = await revalidate(
+            COURSES_CACHE, "courses",
+            lambda v: mcp.call_tool("getCourses", {"if_version": v}),
+        )
+        courses = {}
+        if isinstance(courses_data, list):
+            for course in courses_data:
+                if isinstance(course, dict):
+                    courses[str(course.get('id'))] = course
+        return version, courses
+
+    return (await COURSES_CACHE.get("courses", fetch))[1]
+
+async def load_tasks(mcp, courses: dict, course=None, progress_handler=None) -> list:
+    """Tareas de un curso (o de todos si course es None), vía TASKS_BY_COURSE,
+    como registros con el nombre de su curso (courses: cursos por id)
+
+    Con progress_handler, la carga de todas las tareas pide resultados
+    parciales: cada curso llega en una notificación de progreso al terminar.
+    """
+    key = ALL_TASKS if course is None else str(course.get('id'))
+
+    async def fetch():
+        def call(v):
+            if course is None:
+                return mcp.call_tool(
+                    "get_tasks",
+                    # Las tareas parciales solo en la carga inicial: al
+                    # revalidar, lo más probable es que no haya cambiado nada
+                    {"_params": {"if_version": v, "partial": progress_handler is not None and not v}},
+                    progress_handler=progress_handler,
+                )
+            # getClases espera un dict con key "courses"
+            return mcp.call_tool("getClases", {"courses": [course], "if_version": v})
+
+        cached = TASKS_BY_COURSE.peek(key)
+        version, data = await revalidate(TASKS_BY_COURSE, key, call)
+        if cached and data is cached[1]:
+            # "notModified": ya son los registros guardados
+            return version, data
+        tasks = to_records(data if isinstance(data, list) else [], course_namer(courses))
+        # Mantener el índice de entregas al día, solo si algo cambió
+        if not cached or cached[0] != version or not version:
+            if course is None:
+                DUE_INDEX.replace_all(tasks)
+            else:
+                DUE_INDEX.replace_course(key, tasks)
+        return version, tasks
+
+    return (await TASKS_BY_COURSE.get(key, fetch))[1]
+
+async def query_tasks(mcp, courses: dict, limit=None, **filters) -> list:
+    """Tareas filtradas en el servidor (tool query_tasks); sin caché.
+
+    Sin limit llegan todas, igual que al responder desde DUE_INDEX (el
+    servidor corta en 50 si no se le dice nada); de cuántas se mandan a la
+    IA ya se encarga el presupuesto de PACKER.
+    """
+    args = {k: v for k, v in filters.items() if v is not None}
+    args["limit"] = limit
+    result = unwrap_tool_result(await mcp.call_tool("query_tasks", args))
+    return to_records(result if isinstance(result, list) else [], course_namer(courses))
+
+PENDING_CUES = (
+    " pendiente", " falta entregar", " faltan entregar", " me falta", " me faltan",
+    " por entregar", " sin entregar", " no he entregado", " tengo que entregar",
+)
+
+def asks_for_pending(text: str) -> bool:
+    """¿Pregunta por lo que aún no ha entregado?"""
+    t = f" {normalize(text)} "
+    return any(cue in t for cue in PENDING_CUES)
+
+async def pending_tasks(mcp, courses: dict, course_ids=None) -> list:
+    """Tareas sin entregar (tool get_pending_tasks); sin caché"""
+    args = {"course_ids": course_ids} if course_ids else {}
+    result = unwrap_tool_result(await mcp.call_tool("get_pending_tasks", args))
+    return to_records(result if isinstance(result, list) else [], course_namer(courses))
+
+def course_progress(courses: dict, say=print):
+    """progress_handler que muestra los cursos ya listos y va codificando sus
+    tareas para la IA (PACKER.fragment) mientras llegan los demás, así al
+    final empaquetar es solo juntar fragmentos ya hechos.
+
+    Devuelve (handler, estado); estado["shown"] indica si se imprimió algo.
+    Con estado["done"] el handler deja de imprimir: la carga puede seguir
+    como revalidación en segundo plano (TTLCache) mientras la IA responde.
+    """
+    state = {"tasks": 0, "shown": False, "done": False}
+
+    async def handler(progress, total, message):
+        try:
+            update = json.loads(message) if message else {}
+        except ValueError:
+            update = {}
+        for task in to_records(update.get('items') or [], course_namer(courses)):
+            PACKER.fragment(task)
+            TASK_INDEX.add(task)
+            DUE_INDEX.add(task)
+            state["tasks"] += 1
+        if state["done"]:
+            return
+        state["shown"] = True
+        say(f"\r   ⏳ {int(progress)}/{int(total or 0)} cursos · {state['tasks']} tareas", end="", flush=True)
+
+    return handler, state
+
+def describe_window(start, end) -> str:
+    if start is None:
+        return f"hasta el {end.isoformat()}"
+    if start == end:
+        return f"el {start.isoformat()}"
+    return f"del {start.isoformat()} al {end.isoformat()}"
+
+def print_cache_stats(file=None):
+    for name, cache in (("cursos", COURSES_CACHE), ("tareas", TASKS_BY_COURSE)):
+        stats = ", ".join(f"{k}={v}" for k, v in cache.stats().items())
+        print(f"   {name}: {stats}", file=file)
+
+def quiet(*args, **kwargs):
+    """say que no muestra nada (modo batch)"""
+
+async def find_tasks(mcp, user_input: str, say=print) -> list:
+    """Las tareas con las que responder la pregunta: las pendientes, las de
+    un rango de fechas, las de los cursos que nombra o todas."""
+    # Primero obtener/actualizar caché de cursos (si la precarga
+    # sigue en curso, load_courses se une a ella)
+    first_load = "courses" not in COURSES_CACHE
+    if first_load:
+        say("\n📚 Consultando tus cursos de Google Classroom...")
+    courses = await load_courses(mcp)
+    if first_load:
+        say(f"   ✓ {len(courses)} cursos encontrados\n")
+
+    # Buscar si el usuario menciona un curso específico
+    course_filter = find_course_by_name(user_input, courses)
+
+    # ¿Pregunta por un rango de fechas ("esta semana", "mañana")?
+    # Entonces el servidor filtra y solo llegan esas tareas
+    window = time_window(user_input)
+
+    if asks_for_pending(user_input):
+        # Solo lo que falta entregar: el servidor cruza tareas y entregas
+        say("\n📝 Buscando lo que te falta entregar...")
+        result = await pending_tasks(mcp, courses, course_ids=course_filter or None)
+        say(f"   ✓ {len(result)} tareas pendientes\n")
+
+    elif window:
+        start, end = window
+        say(f"\n📅 Buscando tareas con entrega {describe_window(start, end)}...")
+        if ALL_TASKS in TASKS_BY_COURSE:
+            # Ya están todas las tareas en caché: el índice
+            # local da la ventana sin pedirla al servidor
+            await load_tasks(mcp, courses)
+            result = DUE_INDEX.range(start, end, course_ids=course_filter or None)
+        else:
+            result = await query_tasks(
+                mcp,
+                courses,
+                course_ids=course_filter or None,
+                due_after=start.isoformat() if start else None,
+                due_before=end.isoformat() if end else None,
+            )
+        say(f"   ✓ {len(result)} tareas encontradas\n")
+
+    elif course_filter:
+        course_names = [courses[cid].get('name') for cid in course_filter]
+        say(f"🎯 Buscando tareas de: {', '.join(course_names)}")
+        # Obtener solo tareas de esos cursos
+        result = []
+        for cid in course_filter:
+            course_name = courses[cid].get('name', 'Sin nombre')
+
+            # Verificar si ya tenemos en caché
+            if cid not in TASKS_BY_COURSE:
+                say(f"   📖 Cargando {course_name}...")
+
+            result.extend(await load_tasks(mcp, courses, courses[cid]))
+
+        say(f"   ✓ {len(result)} tareas encontradas\n")
+
+    else:
+        # No hay filtro, obtener todas las tareas
+        say("\n📚 Obteniendo todas tus tareas...")
+        handler, progress = course_progress(courses, say)
+        result = await load_tasks(mcp, courses, progress_handler=handler)
+        progress["done"] = True
+        if progress["shown"]:
+            say()
+
+        say(f"   ✓ {len(result)} tareas encontradas\n")
+
+    return result
+
+async def answer(mcp, user_input: str, say=print, echo=True) -> dict:
+    """Responde una pregunta de principio a fin: decide si es de Classroom,
+    busca las tareas, las empaqueta y pide el resumen a la IA.
+
+    say muestra el progreso (print en el modo interactivo, quiet en batch) y
+    con echo la respuesta se imprime en streaming. Devuelve un dict con la
+    respuesta ("answer"), si hizo falta Classroom, las tareas encontradas y
+    las enviadas a la IA, y "error" si algo falló.
+    """
+    out = {"answer": None, "classroom": False}
+
+    # 1️⃣ ¿Necesita classroom? Las preguntas claras se resuelven localmente
+    # y solo las dudosas (o las que no son de classroom) van a la IA
+    if route(user_input) == CLASSROOM:
+        reply = CALL_CLASSROOM
+    else:
+        reply = await classify_with_llm(user_input, echo=echo)
+
+    # 2️⃣ ¿La IA quiere llamar Classroom?
+    if CALL_CLASSROOM not in reply.upper():
+        out["answer"] = reply
+        return out
+    out["classroom"] = True
+
+    try:
+        result = await find_tasks(mcp, user_input, say)
+    except Exception as e:
+        say(f"\n❌ Ups! Algo salió mal: {e}\n")
+        out["error"] = str(e)
+        return out
+    out["tasks"] = len(result)
+
+    # Si no hay tareas
+    if not result:
+        say("📭 No encontré tareas aquí")
+        say("   ¿Seguro que tienes tareas en ese curso?\n")
+        out["answer"] = "📭 No encontré tareas aquí"
+        return out
+
+    # 3️⃣ Preparar payload optimizado con TOON, ajustado a un
+    # presupuesto de tokens estimado localmente (sin esperar un 413)
+    system_msg = f"""Eres un asistente amigable de Google Classroom.
+
+Usuario preguntó: "{user_input}"
+
+Los datos están en formato TOON (Token-Oriented Object Notation) - un formato compacto similar a JSON.
+Organiza y resume las tareas de forma clara y amigable. 
+Si son de un curso específico, enfócate en ese.
+Si son de varios cursos, agrúpalas por materia.
+Usa emojis para hacerlo más divertido."""
+
+    budget = PACKER.budget - estimate_tokens(system_msg)
+
+    # Las tareas que mejor responden a la pregunta, de más a menos
+    # relevante (empates por fecha de entrega); si la pregunta no
+    # nombra ningún tema de las tareas, todas por fecha de entrega
+    tasks = list(result)
+    priority = due_priority()
+    relevant = TASK_INDEX.rank(user_input, sorted(tasks, key=priority), k=RANK_TOP_K)
+    if relevant:
+        tasks, priority = relevant, None
+        say(f"🔎 {len(relevant)} tareas relevantes para tu pregunta")
+    payload, included = PACKER.pack(tasks, budget=budget, priority=priority)
+    out["included"] = included
+
+    say(f"🤖 Analizando {included} de {len(result)} tareas...\n")
+
+    try:
+        out["answer"] = await stream_completion([
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": payload},
+        ], echo=echo)
+    except Exception as e:
+        # Si la estimación local se quedó corta, un único reintento
+        # con la mitad del presupuesto
+        err = str(e)
+        if "tokens_limit_reached" in err or "413" in err:
+            say("[DEBUG] Payload muy grande, reduciendo...")
+            payload, out["included"] = PACKER.pack(tasks, budget=budget // 2, priority=priority)
+            try:
+                out["answer"] = await stream_completion([
+                    {"role": "system", "content": system_msg},
+                    {"role": "user", "content": payload},
+                ], echo=echo)
+            except Exception as e2:
+                say("Error llamando a la IA tras recorte:", e2)
+                out["error"] = str(e2)
+        else:
+            say("Error llamando a la IA:", e)
+            out["error"] = err
+    return out
+
 async def main():
-    mcp = Client("main.py")
+    mcp = Client(MCP_SERVER)
 
     async with mcp:
         print("IA lista. Escribe preguntas.\n")
 
+        # Los cursos se cargan en segundo plano mientras el usuario escribe
+        # y mientras la IA decide si la pregunta es de Classroom
+        courses_task = asyncio.create_task(load_courses(mcp))
+        # Si la precarga falla, se reintenta al necesitar los cursos
+        courses_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
         while True:
-            user_input = input("> ").strip()
+            user_input = (await asyncio.to_thread(input, "> ")).strip()
 
             if not user_input:
                 continue
@@ -149,172 +521,118 @@ async def main():
             # Salir
             if user_input.lower() in ['salir', 'exit', 'quit']:
                 print("¡Hasta luego!")
+                courses_task.cancel()
                 break
 
-            # 1️⃣ Preguntamos a la IA si necesita classroom
-            response = ai.chat.completions.create(
-                model="openai/gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_input},
-                ],
-                temperature=0.1,
-            )
+            if user_input.lower() == '/stats':
+                print_cache_stats()
+                continue
 
-            answer = response.choices[0].message.content.strip()
+            await answer(mcp, user_input)
 
-            # 2️⃣ ¿La IA quiere llamar Classroom?
-            if "CALL_CLASSROOM" in answer.upper():
-                
-                global COURSES_CACHE, TASKS_BY_COURSE
-                
-                try:
-                    # Primero obtener/actualizar caché de cursos
-                    if not COURSES_CACHE:
-                        print("\n📚 Consultando tus cursos de Google Classroom...")
-                        courses_result = await mcp.call_tool("getCourses", {})
-                        courses_data = unwrap_tool_result(courses_result)
-                        
-                        if isinstance(courses_data, list):
-                            for course in courses_data:
-                                if isinstance(course, dict):
-                                    cid = str(course.get('id'))
-                                    COURSES_CACHE[cid] = course
-                        
-                        print(f"   ✓ {len(COURSES_CACHE)} cursos encontrados\n")
-                    
-                    # Buscar si el usuario menciona un curso específico
-                    course_filter = find_course_by_name(user_input, COURSES_CACHE)
-                    
-                    if course_filter:
-                        course_names = [COURSES_CACHE[cid].get('name') for cid in course_filter]
-                        print(f"🎯 Buscando tareas de: {', '.join(course_names)}")
-                        # Obtener solo tareas de esos cursos
-                        all_tasks = []
-                        for cid in course_filter:
-                            course_name = COURSES_CACHE[cid].get('name', 'Sin nombre')
-                            
-                            # Verificar si ya tenemos en caché
-                            if cid not in TASKS_BY_COURSE:
-                                print(f"   📖 Cargando {course_name}...")
-                                # getClases espera un dict con key "courses"
-                                tasks_result = await mcp.call_tool("getClases", {"courses": [COURSES_CACHE[cid]]})
-                                tasks_data = unwrap_tool_result(tasks_result)
-                                TASKS_BY_COURSE[cid] = tasks_data if isinstance(tasks_data, list) else []
-                            
-                            # Agregar courseName a cada tarea
-                            for task in TASKS_BY_COURSE[cid]:
-                                if isinstance(task, dict):
-                                    task['courseName'] = course_name
-                                    all_tasks.append(task)
-                        
-                        result = all_tasks
-                        print(f"   ✓ {len(result)} tareas encontradas\n")
-                    
-                    else:
-                        # No hay filtro, obtener todas las tareas
-                        print("\n📚 Obteniendo todas tus tareas...")
-                        result = await mcp.call_tool("get_tasks", {})
-                        result = unwrap_tool_result(result)
-                        
-                        # Agregar nombre del curso
-                        if isinstance(result, list):
-                            for task in result:
-                                if isinstance(task, dict):
-                                    cid = str(task.get('courseId', ''))
-                                    task['courseName'] = COURSES_CACHE.get(cid, {}).get('name', f'Curso {cid}')
-                        
-                        print(f"   ✓ {len(result) if isinstance(result, list) else 0} tareas encontradas\n")
-                    
-                    
-                except Exception as e:
-                    print(f"\n❌ Ups! Algo salió mal: {e}\n")
-                    continue
-
-                # Si no hay tareas
-                if not result or (isinstance(result, list) and len(result) == 0):
-                    print("📭 No encontré tareas aquí")
-                    print("   ¿Seguro que tienes tareas en ese curso?\n")
-                    continue
-
-                # 3️⃣ Preparar payload optimizado con TOON
-                def format_tasks(items, max_items=100, max_chars=None):
-                    compact = []
-                    if isinstance(items, dict):
-                        items = [items]
-                    
-                    for t in (items or [])[:max_items]:
-                        if not isinstance(t, dict):
-                            continue
-                        task_info = {
-                            "courseName": t.get("courseName", "Sin curso"),
-                            "title": t.get("title") or t.get("name") or "Sin título",
-                            "description": (t.get("description") or "")[:200],
-                            "dueDate": t.get("dueDate"),
-                        }
-                        # Limpiar None
-                        task_info = {k: v for k, v in task_info.items() if v}
-                        compact.append(task_info)
-                    
-                    # Usar TOON en lugar de JSON (30-60% menos tokens!)
-                    result_toon = encode(compact)
-                    
-                    # Si hay límite de caracteres y se excede
-                    if max_chars and len(result_toon) > max_chars:
-                        # Reducir items
-                        compact = compact[:max(1, max_items // 2)]
-                        result_toon = encode(compact)
-                    
-                    return result_toon
-
-                payload = format_tasks(result, max_items=30)
-                
-                print(f"🤖 Analizando {len(result)} tareas...\n")
-
-                system_msg = f"""Eres un asistente amigable de Google Classroom.
+# Modo batch: preguntas en JSONL (un objeto {"id": ..., "question": ...} o
+# una cadena JSON por línea), respuestas en JSONL según van terminando.
+BATCH_CONCURRENCY = int(os.environ.get("CLIENT_BATCH_CONCURRENCY", "4"))
 
-Usuario preguntó: "{user_input}"
+def read_questions(lines) -> list[dict]:
+    """Preguntas del batch con su id (el número de línea si no trae uno);
+    las líneas que no se entienden quedan con "error"."""
+    questions = []
+    for n, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            item = {"error": "línea JSON inválida"}
+        if isinstance(item, str):
+            item = {"question": item}
+        if not isinstance(item, dict) or not isinstance(item.get("question", ""), str):
+            item = {"error": "se esperaba un objeto con \"question\""}
+        item.setdefault("id", n)
+        if not item.get("error") and not item.get("question", "").strip():
+            item["error"] = "pregunta vacía"
+        questions.append(item)
+    return questions
 
-Los datos están en formato TOON (Token-Oriented Object Notation) - un formato compacto similar a JSON.
-Organiza y resume las tareas de forma clara y amigable. 
-Si son de un curso específico, enfócate en ese.
-Si son de varios cursos, agrúpalas por materia.
-Usa emojis para hacerlo más divertido."""
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))]
+
+async def run_batch(source, output, concurrency=BATCH_CONCURRENCY) -> dict:
+    """Responde todas las preguntas de source (iterable de líneas JSONL) y
+    escribe una línea JSON por respuesta en output.
+
+    Como mucho `concurrency` preguntas a la vez, todas sobre la misma sesión
+    MCP y las mismas cachés, así la primera que pide los cursos o las tareas
+    las deja calientes para las demás (y las que llegan a la vez se unen a
+    la misma carga). Al terminar muestra por stderr la latencia por
+    pregunta y el throughput, y devuelve ese resumen.
+    """
+    questions = read_questions(source)
+    limit = asyncio.Semaphore(max(1, concurrency))
+    latencies, failed = [], 0
 
+    def write(record):
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+
+    async with Client(MCP_SERVER) as mcp:
+        async def one(item):
+            nonlocal failed
+            if item.get("error"):
+                failed += 1
+                write({"id": item["id"], "question": item.get("question"), "answer": None, "error": item["error"]})
+                return
+            async with limit:
+                start = time.perf_counter()
                 try:
-                    followup = ai.chat.completions.create(
-                        model="openai/gpt-4.1-mini",
-                        messages=[
-                            {"role": "system", "content": system_msg},
-                            {"role": "user", "content": payload},
-                        ],
-                    )
+                    result = await answer(mcp, item["question"], say=quiet, echo=False)
                 except Exception as e:
-                    # If request too large, retry with a smaller payload
-                    err = str(e)
-                    if "tokens_limit_reached" in err or "413" in err:
-                        print("[DEBUG] Payload muy grande, reduciendo...")
-                        payload = format_tasks(result, max_items=10, max_chars=3000)
-                        try:
-                            followup = ai.chat.completions.create(
-                                model="openai/gpt-4.1-mini",
-                                messages=[
-                                    {"role": "system", "content": system_msg},
-                                    {"role": "user", "content": payload},
-                                ],
-                            )
-                        except Exception as e2:
-                            print("Error llamando a la IA tras recorte:", e2)
-                            continue
-                    else:
-                        print("Error llamando a la IA:", e)
-                        continue
-
-                print(followup.choices[0].message.content)
+                    result = {"answer": None, "error": str(e)}
+                elapsed = time.perf_counter() - start
+            latencies.append(elapsed)
+            failed += bool(result.get("error"))
+            write({"id": item["id"], "question": item["question"], **result, "latency_ms": round(elapsed * 1000, 1)})
 
-            else:
-                print(answer)
+        start = time.perf_counter()
+        await asyncio.gather(*(one(item) for item in questions))
+        wall = time.perf_counter() - start
+
+    summary = {
+        "questions": len(questions),
+        "failed": failed,
+        "seconds": round(wall, 3),
+        "per_second": round(len(questions) / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else None,
+    }
+    print(f"📦 {len(questions)} preguntas en {wall:.1f} s "
+          f"({summary['per_second']:.2f} preguntas/s, {concurrency} a la vez), "
+          f"{failed} con error", file=sys.stderr)
+    if latencies:
+        print(f"   latencia p50 {summary['p50_ms']:.0f} ms · p95 {summary['p95_ms']:.0f} ms · "
+              f"máx {summary['max_ms']:.0f} ms", file=sys.stderr)
+    print_cache_stats(file=sys.stderr)
+    return summary
+
+def _arg(name, default):
+    """Valor que sigue a una opción de la línea de comandos, o default."""
+    if name in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
 
 
 if __name__ == "__main__":
+    # python client.py --batch preguntas.jsonl [--output respuestas.jsonl]
+    #                  [--concurrency N]   ("-" = stdin/stdout)
+    if "--batch" in sys.argv:
+        source, target = _arg("--batch", "-"), _arg("--output", "-")
+        concurrency = int(_arg("--concurrency", BATCH_CONCURRENCY))
+        with (sys.stdin if source == "-" else open(source, encoding="utf-8")) as questions, \
+                (sys.stdout if target == "-" else open(target, "w", encoding="utf-8")) as answers:
+            summary = asyncio.run(run_batch(questions, answers, concurrency))
+        sys.exit(1 if summary["failed"] else 0)
     asyncio.run(main())
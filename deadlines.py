@@ -0,0 +1,203 @@
+"""Normalized due timestamps and a sorted due-date index.
+
+Classroom gives a task's deadline as separate ``dueDate`` ({year, month,
+day}) and ``dueTime`` ({hours, minutes}) objects, both in UTC. ``due_at``
+turns them into one timezone-aware datetime (end of the day when there is
+no time) and ``due_label`` shows it in the user's time zone, so nobody has
+to reason about the raw dicts. ``DueIndex`` keeps tasks sorted by that
+instant as they are ingested, so "due this week" or "overdue" is a range
+lookup: O(log n) to find the window plus O(k) to read it. Client records
+carry the instant precomputed (see records.py) and pass their own ``due``.
+
+Windows are calendar days in the user's time zone (CLASSROOM_TIMEZONE, an
+IANA name such as "America/Santo_Domingo"; the system's by default).
+"""
+
+import bisect
+import datetime
+import os
+import time
+from typing import Any, Callable, Hashable, Iterable
+
+UTC = datetime.timezone.utc
+
+
+class _SystemZone(datetime.tzinfo):
+    """The system's local time zone, with the UTC offset in force at each
+    instant (a fixed ``now().astimezone()`` offset is wrong across DST)."""
+
+    def utcoffset(self, dt):
+        return datetime.timedelta(seconds=self._local(dt).tm_gmtoff)
+
+    def dst(self, dt):
+        local = self._local(dt)
+        return datetime.timedelta(seconds=local.tm_gmtoff + time.timezone) if local.tm_isdst > 0 else _ZERO
+
+    def tzname(self, dt):
+        return self._local(dt).tm_zone
+
+    def fromutc(self, dt):
+        local = time.localtime((dt.replace(tzinfo=None) - _EPOCH).total_seconds())
+        return dt + datetime.timedelta(seconds=local.tm_gmtoff)
+
+    @staticmethod
+    def _local(dt) -> time.struct_time:
+        fields = (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.weekday(), 0, -1)
+        return time.localtime(time.mktime(fields))
+
+    def __repr__(self):
+        return "_SystemZone()"
+
+
+_ZERO = datetime.timedelta(0)
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _zone(name: str | None) -> datetime.tzinfo:
+    if name:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    return _SystemZone()
+
+
+TIMEZONE = _zone(os.environ.get("CLASSROOM_TIMEZONE"))
+
+
+def due_at(task: dict) -> datetime.datetime | None:
+    """A task's deadline as an aware UTC datetime, or None without a (valid) dueDate."""
+    d = task.get("dueDate") or {}
+    t = task.get("dueTime")
+    try:
+        if t is None:
+            return datetime.datetime(d["year"], d["month"], d["day"], 23, 59, tzinfo=UTC)
+        return datetime.datetime(
+            d["year"], d["month"], d["day"], t.get("hours", 0), t.get("minutes", 0), tzinfo=UTC
+        )
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+def due_timestamp(task: dict) -> float | None:
+    """due_at as POSIX seconds (what the index sorts on)."""
+    due = due_at(task)
+    return due.timestamp() if due is not None else None
+
+
+def due_label(task: dict, tz: datetime.tzinfo | None = None) -> str | None:
+    """The deadline in the user's time zone, e.g. "2026-03-09 19:59"."""
+    return local_label(due_at(task), tz)
+
+
+def local_label(due: datetime.datetime | None, tz: datetime.tzinfo | None = None) -> str | None:
+    """An aware deadline as due_label shows it (None stays None)."""
+    if due is None:
+        return None
+    return due.astimezone(tz or TIMEZONE).strftime("%Y-%m-%d %H:%M")
+
+
+def _instant(value, tz: datetime.tzinfo, end: bool) -> float | None:
+    """POSIX seconds for a window bound: a date (start of that day, or start of
+    the next one for an inclusive end), an aware or naive datetime, an ISO
+    string of either or None (unbounded)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        text = value.strip().replace("Z", "+00:00")
+        value = datetime.date.fromisoformat(text) if len(text) == 10 else datetime.datetime.fromisoformat(text)
+    if isinstance(value, datetime.datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=tz)).timestamp()
+    if end:
+        value += datetime.timedelta(days=1)
+    return datetime.datetime.combine(value, datetime.time(), tz).timestamp()
+
+
+def due_window(start=None, end=None, tz: datetime.tzinfo | None = None) -> tuple[float | None, float | None]:
+    """[lo, hi) in POSIX seconds for tasks due from start through end.
+
+    Dates are whole days in tz (default TIMEZONE), so end is inclusive;
+    datetimes are exact instants. None leaves that side open.
+    """
+    tz = tz or TIMEZONE
+    return _instant(start, tz, end=False), _instant(end, tz, end=True)
+
+
+def _task_key(task: dict) -> tuple[str, str]:
+    return (str(task.get("courseId")), str(task.get("id")))
+
+
+class DueIndex:
+    """Tasks sorted by due instant, updated as they are ingested.
+
+    Each entry stores a value per task (the task itself unless given, e.g.
+    just its id when the task lives elsewhere). Adding a task again moves it
+    to its new due instant; tasks without a due date are tracked but never
+    fall in a window. ``due(task)`` gives the instant a task is sorted on
+    (due_timestamp by default).
+    """
+
+    def __init__(self, tasks: Iterable[dict] = (), due: Callable[[Any], float | None] = due_timestamp):
+        self._due = due
+        self._entries: list[tuple[float, str, str]] = []
+        self._values: dict[Hashable, tuple[float | None, Any]] = {}
+        self._by_course: dict[str, set] = {}
+        self.replace_all(tasks)
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, task: dict, value: Any = None):
+        key = _task_key(task)
+        self.remove(key)
+        ts = self._due(task)
+        self._values[key] = (ts, task if value is None else value)
+        self._by_course.setdefault(key[0], set()).add(key)
+        if ts is not None:
+            bisect.insort(self._entries, (ts, *key))
+
+    def remove(self, key: tuple[str, str]):
+        old = self._values.pop(key, None)
+        if old is None:
+            return
+        self._by_course.get(key[0], set()).discard(key)
+        if old[0] is not None:
+            entry = (old[0], *key)
+            i = bisect.bisect_left(self._entries, entry)
+            if i < len(self._entries) and self._entries[i] == entry:
+                del self._entries[i]
+
+    def remove_course(self, course_id):
+        for key in list(self._by_course.pop(str(course_id), ())):
+            self.remove(key)
+
+    def replace_course(self, course_id, tasks: Iterable[dict], values: Iterable[Any] | None = None):
+        """Make tasks the whole content of a course (a full listing)."""
+        self.remove_course(course_id)
+        tasks = list(tasks)
+        for task, value in zip(tasks, values if values is not None else [None] * len(tasks)):
+            self.add(task, value)
+
+    def replace_all(self, tasks: Iterable[dict], values: Iterable[Any] | None = None):
+        """Rebuild from scratch (one sort instead of n insertions)."""
+        tasks = list(tasks)
+        self._values = {}
+        self._by_course = {}
+        for task, value in zip(tasks, values if values is not None else [None] * len(tasks)):
+            key = _task_key(task)
+            self._values[key] = (self._due(task), task if value is None else value)
+            self._by_course.setdefault(key[0], set()).add(key)
+        self._entries = sorted((ts, *key) for key, (ts, _) in self._values.items() if ts is not None)
+
+    def between(self, lo: float | None = None, hi: float | None = None, course_ids=None) -> list:
+        """Values of the tasks due in [lo, hi) (POSIX seconds; None is open),
+        soonest first, optionally only from the given courses."""
+        i = 0 if lo is None else bisect.bisect_left(self._entries, (lo,))
+        j = len(self._entries) if hi is None else bisect.bisect_left(self._entries, (hi,))
+        window = self._entries[i:j]
+        if course_ids is not None:
+            wanted = {str(c) for c in course_ids}
+            window = [e for e in window if e[1] in wanted]
+        return [self._values[(cid, tid)][1] for _, cid, tid in window]
+
+    def range(self, start=None, end=None, course_ids=None, tz: datetime.tzinfo | None = None) -> list:
+        """Values of the tasks due from start through end (see due_window)."""
+        return self.between(*due_window(start, end, tz), course_ids=course_ids)
@@ -0,0 +1,281 @@
+"""Fetch helpers shared by the Classroom MCP tools.
+
+The Classroom API only lists coursework one course at a time, so tools that
+span several courses either fan out over a bounded thread pool instead of
+waiting on each round trip in turn, or pack the per-course calls into Google
+API batch requests (up to 50 calls per multipart round trip). List endpoints
+are paginated; ``iter_pages``/``iter_items`` follow ``nextPageToken`` lazily
+so callers can stop as soon as they have enough. ``SingleFlight`` lets
+concurrent callers asking for the same thing share one call.
+"""
+
+import contextvars
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, Iterator, NamedTuple
+
+# Maximum number of API calls in flight at once (override with
+# CLASSROOM_MAX_IN_FLIGHT).
+DEFAULT_MAX_IN_FLIGHT = int(os.environ.get("CLASSROOM_MAX_IN_FLIGHT", "8"))
+
+# Worker threads of a long-lived fetch pool (override with CLASSROOM_POOL_SIZE).
+# Threads are started on demand, so this only caps concurrent fan-outs.
+POOL_SIZE = int(os.environ.get("CLASSROOM_POOL_SIZE", "32"))
+
+# Google caps a batch request at 50 inner calls.
+BATCH_LIMIT = 50
+
+
+class FetchResult(NamedTuple):
+    """Outcome of fetching one key: either ``value`` or ``error`` is set."""
+
+    key: Any
+    value: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def iter_pages(
+    make_request: Callable[..., Any],
+    execute: Callable[[Any], dict],
+    items_key: str,
+    page_size: int | None = None,
+    **params,
+) -> Iterator[list]:
+    """Yield each page of a paginated list call as a list of items.
+
+    ``make_request(**params)`` builds the call (e.g. ``service.courses().list``)
+    and ``execute(request)`` runs it. The next page is only requested when the
+    caller asks for it, so breaking out of the loop stops the round trips.
+    """
+    if page_size:
+        params["pageSize"] = page_size
+    page_token = None
+    while True:
+        if page_token:
+            params["pageToken"] = page_token
+        resp = execute(make_request(**params)) or {}
+        page = resp.get(items_key, [])
+        yield page if isinstance(page, list) else []
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def iter_items(
+    make_request: Callable[..., Any],
+    execute: Callable[[Any], dict],
+    items_key: str,
+    page_size: int | None = None,
+    **params,
+) -> Iterator[Any]:
+    """Yield the items of a paginated list call one by one (see iter_pages)."""
+    for page in iter_pages(make_request, execute, items_key, page_size, **params):
+        yield from page
+
+
+def fetch_all(
+    fn: Callable[[Any], Any],
+    keys: Iterable[Any],
+    max_in_flight: int | None = None,
+    on_done: Callable[[FetchResult], None] | None = None,
+    executor: Executor | None = None,
+) -> list[FetchResult]:
+    """Call ``fn(key)`` for every key with at most ``max_in_flight`` running.
+
+    Results come back in the same order as ``keys`` regardless of completion
+    order. Exceptions are captured per key instead of aborting the whole
+    fan-out, so one failing course never hides the others. ``on_done`` is
+    called with each result as soon as it completes, on the worker thread.
+    Workers run in a copy of the caller's context, so context variables set
+    by the caller (e.g. the selected account) apply to them too.
+
+    With ``executor`` the calls run on that long-lived pool (still at most
+    ``max_in_flight`` of them at once), so its threads and whatever they keep
+    per thread, such as connections, outlive the call. ``fn`` must not wait
+    on another fan-out over the same pool. Without it a pool is created for
+    this call and shut down when it returns.
+    """
+    keys = list(keys)
+    if not keys:
+        return []
+
+    limit = max_in_flight or DEFAULT_MAX_IN_FLIGHT
+    limit = max(1, min(limit, len(keys)))
+
+    def run(key):
+        try:
+            result = FetchResult(key, fn(key))
+        except Exception as e:
+            result = FetchResult(key, error=e)
+        if on_done is not None:
+            on_done(result)
+        return result
+
+    if limit == 1:
+        return [run(key) for key in keys]
+
+    contexts = [contextvars.copy_context() for _ in keys]
+    if executor is not None:
+        # ``limit`` workers take keys from a shared queue, so one call never
+        # holds more than ``limit`` of the pool's threads.
+        pending = deque(enumerate(zip(contexts, keys)))
+        results: list[FetchResult | None] = [None] * len(keys)
+
+        def drain():
+            while True:
+                try:
+                    index, (context, key) = pending.popleft()
+                except IndexError:
+                    return
+                results[index] = context.run(run, key)
+
+        for future in [executor.submit(drain) for _ in range(limit)]:
+            future.result()
+        return results
+
+    with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="classroom-fetch") as pool:
+        return list(pool.map(lambda context, key: context.run(run, key), contexts, keys))
+
+
+def fetch_batched(
+    new_batch: Callable[[], Any],
+    make_request: Callable[[Any, str | None], Any],
+    keys: Iterable[Any],
+    items_key: str,
+    http_factory: Callable[[], Any] | None = None,
+    batch_size: int = BATCH_LIMIT,
+    max_in_flight: int | None = None,
+    limit: int | None = None,
+    schedule: Callable[[Callable[[], Any], int], Any] | None = None,
+    executor: Executor | None = None,
+) -> list[FetchResult]:
+    """Fetch a paginated list for every key using batch HTTP requests.
+
+    ``new_batch`` creates an empty batch (``service.new_batch_http_request``)
+    and ``make_request(key, page_token)`` builds the list call for one key.
+    Each round packs the outstanding calls ``batch_size`` at a time; keys whose
+    response carries a ``nextPageToken`` are queued for the next round, so
+    follow-up pages are batched too. Responses are demultiplexed back to their
+    key and the items under ``items_key`` are concatenated.
+
+    ``http_factory`` returns the Http used to execute each batch (``None``
+    falls back to the Http of the first request in the batch), which lets
+    callers hand out per-thread connections or canned ``HttpMockSequence``
+    responses. Separate batches of one round run concurrently, bounded by
+    ``max_in_flight``. With ``limit``, a key stops paging once it has that
+    many items.
+
+    ``schedule(send, cost)`` runs each batch round trip given the number of
+    calls it carries (e.g. ``QuotaScheduler.call``); ``send`` builds a fresh
+    batch every time, so it may be called again to retry. ``executor`` is
+    passed on to ``fetch_all``.
+    """
+    keys = list(keys)
+    items = [[] for _ in keys]
+    errors: list[Exception | None] = [None] * len(keys)
+    pending = [(i, None) for i in range(len(keys))]
+    batch_size = max(1, min(batch_size, BATCH_LIMIT))
+
+    def run_batch(chunk):
+        next_pages = []
+
+        def callback(request_id, response, exception):
+            index, _ = chunk[int(request_id)]
+            if exception is not None:
+                errors[index] = exception
+                return
+            found = (response or {}).get(items_key, [])
+            if isinstance(found, list):
+                items[index].extend(found)
+            token = (response or {}).get("nextPageToken")
+            if token and (limit is None or len(items[index]) < limit):
+                next_pages.append((index, token))
+
+        def send():
+            batch = new_batch()
+            for request_id, (index, token) in enumerate(chunk):
+                batch.add(make_request(keys[index], token), callback=callback, request_id=str(request_id))
+            batch.execute(http=http_factory() if http_factory else None)
+
+        if schedule is None:
+            send()
+        else:
+            schedule(send, len(chunk))
+        return next_pages
+
+    while pending:
+        chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        pending = []
+        for r in fetch_all(run_batch, chunks, max_in_flight, executor=executor):
+            if r.ok:
+                pending.extend(r.value)
+            else:
+                # The whole round trip failed: every key in it failed.
+                for index, _ in r.key:
+                    errors[index] = r.error
+        pending.sort()
+
+    return [
+        FetchResult(key, error=errors[i]) if errors[i] is not None else FetchResult(key, items[i][:limit])
+        for i, key in enumerate(keys)
+    ]
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key runs ``fn``; callers arriving while it is in
+    flight wait for and share its result (or exception). Nothing is cached
+    once the call completes, so results must be treated as read-only.
+    ``claim``/``finish`` do the same for a set of keys handled together.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self.shared = 0
+
+    def claim(self, keys: Iterable[Hashable]) -> tuple[list, dict[Hashable, Future]]:
+        """Take the lead on every key not already in flight.
+
+        Returns (claimed keys, {key: future} for keys someone else leads).
+        The caller must ``finish`` each claimed key.
+        """
+        mine, theirs = [], {}
+        with self._lock:
+            for key in keys:
+                future = self._calls.get(key)
+                if future is None:
+                    self._calls[key] = Future()
+                    mine.append(key)
+                elif key not in theirs:
+                    self.shared += 1
+                    theirs[key] = future
+        return mine, theirs
+
+    def finish(self, key: Hashable, result: Any = None, error: BaseException | None = None):
+        """Publish the outcome of a claimed key to everyone waiting on it."""
+        with self._lock:
+            future = self._calls.pop(key)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        mine, theirs = self.claim([key])
+        if not mine:
+            return theirs[key].result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, result)
+        return result
@@ -1,18 +1,93 @@
 import os.path
 import sys
-from fastmcp import FastMCP
 import dotenv
 dotenv.load_dotenv()
 
-import os
+import asyncio
+import contextvars
+import functools
+import hashlib
+import inspect
 import json
+import os
+import threading
+import time
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from accounts import DEFAULT_ACCOUNT, Account, current, registry, using
+from deadlines import due_window
+from fetching import DEFAULT_MAX_IN_FLIGHT, fetch_all, fetch_batched, iter_items
+from matcher import matcher_for
+from metrics import metrics
+from projection import TASK_FIELDS, api_fields, merge_fields, project_all
+from query import filter_tasks, sort_tasks
+from scheduler import is_retryable
+
+# fastmcp and the Google client libraries take most of the process start-up
+# time, so they are imported on first use: the MCP server is created by
+# create_server() and Google auth happens on the first tool call (or in the
+# background warm-up started alongside the server).
+if TYPE_CHECKING:
+  from google.oauth2.credentials import Credentials
+
+_mcp = None
+_tools = []
+
+
+# Also time the JSON encoding of every tool result (costs one extra encode).
+MEASURE_SERIALIZATION = os.environ.get("CLASSROOM_METRICS_SERIALIZATION") == "1"
+
+
+def tool(fn=None, *, per_account=True):
+  """Register fn as an MCP tool of the (lazily created) server.
+
+  Calls are timed and counted under "tool.<name>" in the metrics. Unless
+  per_account is false the tool also takes an `account` argument selecting
+  whose data it works on (by default the only or "default" account).
+  """
+  if fn is None:
+    return functools.partial(tool, per_account=per_account)
+  name = f"tool.{fn.__name__}"
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+  @functools.wraps(fn)
+  def timed(*args, account=None, **kwargs):
+    with using(account), metrics.timer(name):
+      result = fn(*args, **kwargs)
+    if MEASURE_SERIALIZATION:
+      start = time.perf_counter()
+      size = len(json.dumps(result, default=str))
+      metrics.observe(f"{name}.serialize", time.perf_counter() - start)
+      metrics.incr(f"{name}.bytes", size)
+    return result
+
+  if per_account:
+    signature = inspect.signature(fn)
+    selector = inspect.Parameter("account", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=str | None)
+    timed.__signature__ = signature.replace(parameters=[*signature.parameters.values(), selector])
+    timed.__annotations__ = {**fn.__annotations__, "account": str | None}
+  _tools.append(timed)
+  return timed
+
+
+def create_server():
+  """Create the FastMCP server and register every tool, once."""
+  global _mcp
+  if _mcp is None:
+    from fastmcp import FastMCP
+    _mcp = FastMCP("classroom-mcp")
+    for fn in _tools:
+      _mcp.tool(fn)
+  return _mcp
+
+
+def __getattr__(name):
+  # Keep `main.mcp` working (e.g. for `fastmcp run main.py`) without paying
+  # for the fastmcp import at module import time.
+  if name == "mcp":
+    return create_server()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-mcp = FastMCP("classroom-mcp")
 
 # If run with --authorize, perform an interactive auth flow and exit.
 STANDALONE_AUTHORIZE = "--authorize" in sys.argv
@@ -21,26 +96,83 @@ SCOPES = [
     "https://www.googleapis.com/auth/classroom.courses.readonly",
     "https://www.googleapis.com/auth/classroom.student-submissions.me.readonly"
 ]
-isLogged = False
-creds = None
-service = None
-courses_cache = None
-cache_file = "courses_cache.json"
+# Local SQLite store for courses and courseWork (":memory:" keeps it in RAM).
+STORE_PATH = os.environ.get("CLASSROOM_STORE", "classroom_store.db")
+# Seconds a synced course list or course is trusted before asking the API again.
+STORE_MAX_AGE = float(os.environ.get("CLASSROOM_STORE_MAX_AGE", "300"))
+# Incremental syncs only see added or edited coursework, so a course is listed
+# in full again (dropping deleted items) once its last full listing is older
+# than this many STORE_MAX_AGE periods.
+STORE_FULL_SYNC_EVERY = float(os.environ.get("CLASSROOM_STORE_FULL_SYNC_EVERY", "12"))
+# Projections pushed down (fields=) when syncing the store. Tool projections
+# are applied on top, so they can only narrow these; ids and updateTime are
+# always kept because sync depends on them. "*" fetches whole resources.
+STORE_COURSE_FIELDS = merge_fields(
+  os.environ.get(
+    "CLASSROOM_STORE_COURSE_FIELDS",
+    "name,section,descriptionHeading,room,ownerId,courseState,creationTime,alternateLink",
+  ),
+  "id,updateTime",
+)
+STORE_COURSEWORK_FIELDS = merge_fields(
+  os.environ.get(
+    "CLASSROOM_STORE_FIELDS",
+    TASK_FIELDS + ",creationTime,alternateLink,maxPoints,topicId,assigneeMode",
+  ),
+  "id,courseId,updateTime",
+)
+# How multi-course coursework fetches hit the API: "concurrent" issues one
+# call per course over a thread pool, "batch" packs them into batch requests.
+FETCH_MODE = os.environ.get("CLASSROOM_FETCH_MODE", "concurrent")
+# Page sizes per list endpoint. Accounts rarely have more than a page of
+# courses; courseWork pages shrink to the caller's limit when one is given.
+COURSES_PAGE_SIZE = 100
+COURSEWORK_PAGE_SIZE = 100
+# Where `python main.py --http` listens (--host/--port override these).
+HTTP_HOST = os.environ.get("CLASSROOM_HTTP_HOST", "127.0.0.1")
+HTTP_PORT = int(os.environ.get("CLASSROOM_HTTP_PORT", "8000"))
+# Multi-account mode: every authorized-user token file <name>.json in this
+# directory is an account (store in <name>.db next to it). Without it there
+# is a single account on token.json and STORE_PATH (--accounts overrides).
+ACCOUNTS_DIR = os.environ.get("CLASSROOM_ACCOUNTS_DIR")
+# Accounts synced / warmed up at the same time.
+ACCOUNT_WORKERS = int(os.environ.get("CLASSROOM_ACCOUNT_WORKERS", "8"))
+
+
+def load_accounts(directory=None):
+  """Replace the registered accounts with those found in directory, or with
+  the single default account when no directory is given.
+
+  A missing or empty directory leaves no accounts (so --authorize can add the
+  first one); serve() refuses to start that way.
+  """
+  registry.clear()
+  if directory is None:
+    registry.add(Account(DEFAULT_ACCOUNT, "token.json", STORE_PATH))
+  elif os.path.isdir(directory):
+    registry.load_dir(directory)
+
+
+load_accounts(ACCOUNTS_DIR)
 
-def auth() -> Credentials:
-  global isLogged
-  global creds
-  global service
 
-  if os.path.exists("token.json"):
-    creds = Credentials.from_authorized_user_file("token.json", SCOPES)
-    isLogged = True
+def auth(account=None) -> "Credentials":
+  """Load, refresh or (with --authorize) obtain the account's credentials and
+  build its service; defaults to the current account."""
+  account = account or current()
+
+  from google.auth.transport.requests import Request
+  from google.oauth2.credentials import Credentials
+
+  creds = account.creds
+  if os.path.exists(account.token_path):
+    creds = Credentials.from_authorized_user_file(account.token_path, SCOPES)
 
   if not creds or not creds.valid:
     if creds and creds.expired and creds.refresh_token:
       print("🔄 Refrescando token...", file=sys.stderr)
-      creds.refresh(Request())
-      isLogged = True
+      with metrics.timer("auth.refresh"):
+        creds.refresh(Request())
     else:
       # If running as a JSON-RPC server over stdio, we must not read from stdin
       # or write human messages to stdout (it would break the protocol). Instead,
@@ -58,6 +190,7 @@ def auth() -> Credentials:
 
       print("🔐 Iniciando flujo de autorización de Google Classroom...", file=sys.stderr)
       print("", file=sys.stderr)
+      from google_auth_oauthlib.flow import InstalledAppFlow
       flow = InstalledAppFlow.from_client_secrets_file("credentials.json", SCOPES)
       
       # Configurar redirect_uri explícitamente
@@ -90,202 +223,848 @@ def auth() -> Credentials:
       try:
         flow.fetch_token(code=code)
         creds = flow.credentials
-        isLogged = True
         print("✅ Autorización exitosa!", file=sys.stderr)
       except Exception as e:
         print(f"❌ Error al obtener token: {e}", file=sys.stderr)
         sys.exit(1)
 
-  with open("token.json", "w") as token:
+  with open(account.token_path, "w") as token:
     token.write(creds.to_json())
 
-  service = build("classroom", "v1", credentials=creds)
+  account.creds = creds
+  with metrics.timer("service.build"):
+    account.service = build_service(creds)
 
   return creds
 
 
+def build_service(credentials):
+  """Build the Classroom service from the discovery document bundled with
+  googleapiclient, so start-up never fetches it over the network."""
+  from googleapiclient.discovery import build
+  return build(
+    "classroom", "v1", credentials=credentials, static_discovery=True, cache_discovery=False
+  )
+
+
+def ensure_service():
+  """Authenticate and build the current account's service once; safe to
+  call from any thread."""
+  account = current()
+  if account.service is None:
+    with account.auth_lock:
+      if account.service is None:
+        auth(account)
+  return account.service
+
+
+def warm_up():
+  """Import the Google stack and build every account's service ahead of the
+  first call."""
+  def prepare(account):
+    with using(account.name):
+      ensure_service()
+
+  for r in fetch_all(prepare, list(registry), ACCOUNT_WORKERS):
+    if not r.ok:
+      metrics.error("warm_up", r.error, account=r.key.name)
+      print(f"⚠️  No se pudo preparar el servicio de {r.key.name}: {r.error}", file=sys.stderr)
+
+
+class _MeteredHttp:
+  """Http wrapper counting HTTP round trips and response bytes."""
+
+  def __init__(self, http):
+    self._http = http
+
+  def request(self, *args, **kwargs):
+    metrics.incr("api.http_requests")
+    resp, content = self._http.request(*args, **kwargs)
+    metrics.incr("api.bytes_received", len(content or b""))
+    return resp, content
+
+  def __getattr__(self, name):
+    return getattr(self._http, name)
+
+
+def _thread_http():
+  """Return an authorized Http for the current thread.
+
+  httplib2.Http is not thread-safe, so each fetch worker gets its own. The
+  account's pool threads are long-lived, so it is kept until the account's
+  credentials are replaced.
+  """
+  account = current()
+  if account.creds is None:
+    return None
+  http = getattr(account.local, "http", None)
+  if http is None or http.credentials is not account.creds:
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+    http = account.local.http = _MeteredHttp(AuthorizedHttp(account.creds, http=httplib2.Http()))
+  return http
+
+
+def execute(request):
+  """Execute a googleapiclient request on the calling thread's Http.
+
+  The call waits for the current account's quota and is retried on 429/5xx
+  by its scheduler. Each attempt is timed and counted per API method
+  ("api.<methodId>"). Concurrent identical requests (same method, URI and
+  body) are sent only once.
+  """
+  method = getattr(request, "methodId", None) or "request"
+
+  def attempt():
+    with metrics.timer(f"api.{method}"):
+      return request.execute(http=_thread_http())
+
+  account = current()
+  key = (method, getattr(request, "uri", None) or id(request), getattr(request, "body", None))
+  return account.inflight.do(key, lambda: account.scheduler.call(attempt))
+
+
+def iter_courses(fields=STORE_COURSE_FIELDS):
+  """Stream every course the user can see, following nextPageToken."""
+  params = {}
+  if api_fields(fields, "courses"):
+    params["fields"] = api_fields(fields, "courses")
+  return iter_items(current().service.courses().list, execute, "courses", COURSES_PAGE_SIZE, **params)
+
+
+def iter_coursework(course_id, limit=None, order_by=None, fields=STORE_COURSEWORK_FIELDS):
+  """Stream a course's courseWork page by page; stop early to save requests."""
+  params = {"courseId": str(course_id)}
+  if order_by:
+    params["orderBy"] = order_by
+  if api_fields(fields, "courseWork"):
+    params["fields"] = api_fields(fields, "courseWork")
+  page_size = min(limit, COURSEWORK_PAGE_SIZE) if limit else COURSEWORK_PAGE_SIZE
+  items = iter_items(current().service.courses().courseWork().list, execute, "courseWork", page_size, **params)
+  return islice(items, limit)
+
+
+def fetch_coursework(
+  course_ids, max_in_flight=None, mode=None, limit=None, order_by=None, fields=STORE_COURSEWORK_FIELDS,
+  on_done=None,
+):
+  """Fetch courseWork for several courses.
+
+  mode is "concurrent" (one call per course over a thread pool) or "batch"
+  (calls packed into batch requests); it defaults to FETCH_MODE. Every page
+  is followed unless limit caps the items per course, and only the projected
+  fields are requested. Returns one FetchResult per course id, in the order
+  given. Failures are reported on stderr and left in the result for the
+  caller to handle. on_done gets each course's result as soon as it is final
+  (at the end in batch mode).
+  """
+  mode = mode or FETCH_MODE
+  max_in_flight = max_in_flight or DEFAULT_MAX_IN_FLIGHT
+  account = current()
+
+  def fetch_one(course_id):
+    with metrics.timer(f"course.{account.name}.{course_id}"):
+      return list(iter_coursework(course_id, limit, order_by, fields))
+
+  if mode == "batch":
+    service = account.service
+    page_size = min(limit, COURSEWORK_PAGE_SIZE) if limit else COURSEWORK_PAGE_SIZE
+    results = fetch_batched(
+      service.new_batch_http_request,
+      lambda course_id, page_token: service.courses().courseWork().list(
+        courseId=str(course_id), pageToken=page_token, pageSize=page_size, orderBy=order_by,
+        fields=api_fields(fields, "courseWork"),
+      ),
+      course_ids,
+      "courseWork",
+      http_factory=_thread_http,
+      max_in_flight=max_in_flight,
+      limit=limit,
+      schedule=account.scheduler.call,
+      executor=account.executor,
+    )
+    # Inner calls throttled inside a batch come back as per-course errors;
+    # retry those courses one by one through the scheduler.
+    retry = [r.key for r in results if not r.ok and is_retryable(r.error)]
+    if retry:
+      retried = {r.key: r for r in fetch_all(fetch_one, retry, max_in_flight, executor=account.executor)}
+      results = [retried.get(r.key, r) if not r.ok else r for r in results]
+    if on_done is not None:
+      for r in results:
+        on_done(r)
+  elif mode == "concurrent":
+    results = fetch_all(fetch_one, course_ids, max_in_flight, on_done, executor=account.executor)
+  else:
+    raise ValueError(f"unknown fetch mode: {mode!r}")
+
+  for r in results:
+    if not r.ok:
+      metrics.error("coursework", r.error, course_id=r.key, account=account.name)
+      print(f"⚠️  Error obteniendo tareas del curso {r.key}: {r.error}", file=sys.stderr)
+  return results
+
+
+def get_store():
+  """The current account's local coursework store."""
+  return current().get_store()
+
+
 def fetch_courses():
-  """Internal helper: fetch courses using cache or API. Returns a list of course dicts."""
-  global service, courses_cache
-  if service is None:
-    auth()
+  """Internal helper: fetch courses from memory, the local store or the API."""
+  account = current()
+  ensure_service()
+
+  if account.courses_cache is not None:
+    metrics.incr("cache.courses.hits")
+    return account.courses_cache
 
-  if courses_cache is not None:
-    return courses_cache
+  metrics.incr("cache.courses.misses")
+  courses = account.get_store().courses()
+  if courses:
+    account.courses_cache = courses
+    return account.courses_cache
 
-  if os.path.exists(cache_file):
+  return refresh_courses_internal()
+
+
+def _pull_since_watermark(course_id):
+  """Fetch a course's coursework updated after its stored watermark.
+
+  Items come newest first, so paging stops at the first one already seen.
+  """
+  watermark = get_store().watermark(course_id) or ""
+  newer = []
+  for item in iter_coursework(course_id, order_by="updateTime desc"):
+    if (item.get("updateTime") or "") <= watermark:
+      break
+    newer.append(item)
+  return newer
+
+
+class ToolProgress:
+  """Per-course progress of the running tool call, sent to the client as MCP
+  progress notifications ({"courseId", "ok"} JSON messages).
+
+  With items, the tasks of each course re-fetched by this call
+  (items(course_id)) are sent along as partial results; courses that were
+  already up to date only report progress. Callable from any thread; get one
+  from tool_progress().
+  """
+
+  def __init__(self, ctx, loop, context, items=None):
+    self.ctx = ctx
+    self.loop = loop
+    self.context = context
+    self.items = items
+    self.total = 0
+    self.done = 0
+    self._lock = threading.Lock()
+    self._tasks = []
+
+  def begin(self, total):
+    self.total = total
+
+  def __call__(self, course_id, ok=True, fetched=False):
+    update = {"courseId": str(course_id), "ok": ok}
+    if ok and fetched and self.items is not None:
+      update["items"] = self.items(str(course_id))
+    message = json.dumps(update, ensure_ascii=False, default=str)
+    with self._lock:
+      self.done += 1
+      # Run in the tool call's context so the notification finds its request.
+      self.loop.call_soon_threadsafe(self._send, self.done, self.total, message, context=self.context)
+
+  def _send(self, done, total, message):
+    self._tasks.append(asyncio.ensure_future(self.ctx.report_progress(done, total, message)))
+
+  async def _drain(self):
+    for result in await asyncio.gather(*self._tasks, return_exceptions=True):
+      if isinstance(result, Exception):
+        metrics.error("progress", result)
+
+  def flush(self, timeout=10.0):
+    """Wait until every notification is out, so none trails the result.
+
+    Runs after the sync, so a slow client is logged rather than turned into
+    an error for a call that already has its result.
+    """
     try:
-      with open(cache_file, "r", encoding="utf-8") as f:
-        courses_cache = json.load(f)
-        return courses_cache
-    except Exception:
-      pass
+      asyncio.run_coroutine_threadsafe(self._drain(), self.loop).result(timeout)
+    except TimeoutError as e:
+      metrics.error("progress", e)
+      print(f"⚠️  Notificaciones de progreso sin enviar tras {timeout:.0f} s", file=sys.stderr)
 
+
+def tool_progress(items=None):
+  """ToolProgress for the MCP tool call running on this thread, else None."""
+  if _mcp is None:
+    return None
+  from fastmcp.server.dependencies import get_context
   try:
-    results = service.courses().list(pageSize=100).execute()
-    courses = results.get("courses", [])
-  except Exception:
-    courses = []
+    import anyio.from_thread
+    ctx = get_context()
+    loop = anyio.from_thread.run_sync(asyncio.get_running_loop)
+  except RuntimeError:
+    # Not inside a tool call (e.g. called directly from Python).
+    return None
+  return ToolProgress(ctx, loop, contextvars.copy_context(), items)
+
 
-  courses_cache = courses
+def sync_store(course_ids=None, max_age=None, progress=None):
+  """Bring the local store up to date with as few requests as possible.
+
+  The course list is re-read once it is older than max_age (default
+  STORE_MAX_AGE). Courses that are new or whose updateTime changed get a
+  full coursework listing, as do courses last listed in full more than
+  STORE_FULL_SYNC_EVERY x max_age ago (the only way to notice deletions);
+  other courses not synced within max_age only pull coursework newer than
+  their watermark. Returns the ids whose sync failed; their previously
+  stored coursework is kept. progress (a ToolProgress) is told about each
+  course as soon as it is up to date. Safe to call concurrently: a course
+  being synced by another call is waited for, not fetched again.
+  """
+  account = current()
+  syncing = account.syncing
+  st = account.get_store()
+  max_age = STORE_MAX_AGE if max_age is None else max_age
+
+  changed = set()
+  if st.courses_age() > max_age:
+    mine, theirs = syncing.claim([("courses",)])
+    if mine:
+      try:
+        # Re-checked under the claim: another call may have just refreshed it.
+        if st.courses_age() > max_age:
+          metrics.incr("store.courses.misses")
+          try:
+            courses = list(iter_courses())
+          except Exception as e:
+            metrics.error("courses", e, account=current().name)
+            print(f"⚠️  Error obteniendo cursos: {e}", file=sys.stderr)
+          else:
+            changed = set(st.upsert_courses(courses))
+            account.courses_cache = courses
+      finally:
+        syncing.finish(("courses",))
+    else:
+      theirs[("courses",)].result()
+  else:
+    metrics.incr("store.courses.hits")
+
+  if course_ids is None:
+    course_ids = [c.get("id") for c in st.courses() if c.get("id")]
+  course_ids = [str(cid) for cid in course_ids]
+
+  stale = [
+    cid for cid in course_ids
+    if cid in changed or st.watermark(cid) is None or st.coursework_age(cid) > max_age
+  ]
+  # Each stale course is synced by one call at a time; concurrent calls wait
+  # for that sync instead of repeating it.
+  claimed, theirs = syncing.claim(("course", cid) for cid in stale)
+  mine = [key[1] for key in claimed]
+  unfinished = set(mine)
+
+  def finish(course_id, ok):
+    unfinished.discard(course_id)
+    syncing.finish(("course", course_id), ok)
+
+  failed = []
+  try:
+    full = [
+      cid for cid in mine
+      if cid in changed or st.watermark(cid) is None
+      or st.full_sync_age(cid) > STORE_FULL_SYNC_EVERY * max_age
+    ]
+    incremental = [cid for cid in mine if cid not in full and st.coursework_age(cid) > max_age]
+    metrics.incr("store.coursework.hits", len(course_ids) - len(full) - len(incremental))
+    metrics.incr("store.coursework.misses", len(full) + len(incremental))
+    metrics.incr("store.coursework.full_syncs", len(full))
+    metrics.incr("store.coursework.incremental_syncs", len(incremental))
+
+    if progress is not None:
+      progress.begin(len(course_ids))
+    for cid in course_ids:
+      if cid not in full and cid not in incremental and ("course", cid) not in theirs:
+        if cid in unfinished:
+          finish(cid, True)
+        if progress is not None:
+          progress(cid)
+
+    def store_full(r):
+      if r.ok:
+        st.replace_coursework(r.key, r.value)
+      else:
+        failed.append(r.key)
+      finish(r.key, r.ok)
+      if progress is not None:
+        progress(r.key, r.ok, fetched=True)
+
+    def store_incremental(r):
+      if r.ok:
+        st.upsert_coursework(r.key, r.value)
+      else:
+        metrics.error("coursework", r.error, course_id=r.key, account=current().name)
+        print(f"⚠️  Error obteniendo tareas del curso {r.key}: {r.error}", file=sys.stderr)
+        failed.append(r.key)
+      finish(r.key, r.ok)
+      if progress is not None:
+        progress(r.key, r.ok, fetched=True)
+
+    fetch_coursework(full, on_done=store_full)
+    fetch_all(_pull_since_watermark, incremental, on_done=store_incremental, executor=account.executor)
+  finally:
+    for cid in list(unfinished):
+      finish(cid, False)
+
+  for (_, cid), future in theirs.items():
+    ok = future.result()
+    if not ok:
+      failed.append(cid)
+    if progress is not None:
+      progress(cid, ok)
+  return failed
+
+
+def content_version(result):
+  """Short hash identifying a tool result's content.
+
+  Results are built in a deterministic order from the store, so keys are
+  not sorted (that would cost more than the hash itself).
+  """
+  encoded = json.dumps(result, separators=(",", ":"), default=str)
+  return hashlib.blake2b(encoded.encode(), digest_size=8).hexdigest()
+
+
+def conditional(result, if_version):
+  """Apply a tool's `if_version` argument to its result.
+
+  Without if_version the plain result is returned. Otherwise the result is
+  wrapped as {"version", "items"}, or reduced to {"version", "notModified":
+  true} when its version equals if_version. Pass "" to get the first version.
+  """
+  if if_version is None:
+    return result
+  version = content_version(result)
+  if if_version == version:
+    metrics.incr("conditional.hits")
+    return {"version": version, "notModified": True}
+  metrics.incr("conditional.misses")
+  return {"version": version, "items": result}
+
+
+def sync_with_progress(course_ids=None, partial_items=None):
+  """sync_store for a tool call, reporting each course to the client.
+
+  partial_items(course_id), when given, returns the tasks a finished course
+  contributes to the result; they are sent along as partial results.
+  """
+  progress = tool_progress(partial_items)
   try:
-    with open(cache_file, "w", encoding="utf-8") as f:
-      json.dump(courses_cache, f, ensure_ascii=False, indent=2)
-  except Exception:
-    pass
+    return sync_store(course_ids, progress=progress)
+  finally:
+    if progress is not None:
+      progress.flush()
 
-  return courses_cache
 
-@mcp.tool
-def getCourses():
+@tool
+def getCourses(fields: str | None = None, if_version: str | None = None):
+  """Return the user's courses, optionally projected to `fields`.
+
+  With `if_version` the result carries its version (see conditional()).
+  """
   # Expose as a tool but delegate to internal fetcher to avoid calling the tool wrapper
-  return fetch_courses()
+  return conditional(project_all(fetch_courses(), fields), if_version)
     
-@mcp.tool
-def getClases(courses):
-  global service
-  if service is None:
-    auth()
+@tool
+def getClases(
+  courses, fields: str | None = TASK_FIELDS, if_version: str | None = None, partial: bool = False
+):
+  """Return the coursework of the given courses, projected to `fields`.
+
+  `fields` uses the Google partial-response syntax ("title,dueDate"); pass
+  "*" for the whole stored resource. With `if_version` the result carries
+  its version and is replaced by a "notModified" marker when unchanged.
+  Progress is reported per course; with `partial` each progress message
+  also carries that course's tasks.
+  """
+  ensure_service()
 
   if isinstance(courses, dict):
     courses = [courses]
   if not isinstance(courses, list):
     raise TypeError("courses must be a dict or a list of dicts")
 
+  course_ids = [
+    course.get("id") for course in courses
+    if isinstance(course, dict) and course.get("id")
+  ]
+
+  sync_with_progress(
+    course_ids, (lambda cid: project_all(get_store().coursework([cid]), fields)) if partial else None
+  )
+
+  # Courses that still failed after the scheduler's retries are served from
+  # whatever the store already had (and reported in get_metrics).
   all_coursework = []
-  for course in courses:
-    if not isinstance(course, dict):
-      continue
-    course_id = course.get("id")
-    if not course_id:
-      continue
-    try:
-      resp = service.courses().courseWork().list(
-        courseId=str(course_id)
-      ).execute()
-      all_coursework.extend(resp.get("courseWork", []))
-    except Exception:
-      all_coursework.append([])
+  st = get_store()
+  for course_id in course_ids:
+    all_coursework.extend(st.coursework([course_id]))
 
-  return all_coursework
+  return conditional(project_all(all_coursework, fields), if_version)
 
 
-@mcp.tool
+@tool
 def refresh_courses(_params=None):
-  """Force refresh the courses cache from Classroom API."""
-  return refresh_courses_internal()
+  """Force refresh the courses cache from Classroom API.
+
+  Accepts an optional `fields` projection in params.
+  """
+  fields = _params.get("fields") if isinstance(_params, dict) else None
+  return project_all(refresh_courses_internal(), fields)
 
 
 def refresh_courses_internal():
-  """Internal helper that refreshes the courses cache and returns the list."""
-  global service, courses_cache
-  if service is None:
-    auth()
+  """Internal helper that refreshes the courses cache and returns the list.
+
+  Concurrent refreshes (e.g. several callers missing the cache at once)
+  share a single one.
+  """
+  ensure_service()
+  return current().inflight.do("refresh_courses", _refresh_courses)
 
-  try:
-    results = service.courses().list(pageSize=200).execute()
-    courses = results.get("courses", [])
-  except Exception:
-    courses = []
 
-  courses_cache = courses
+def _refresh_courses():
+  account = current()
   try:
-    with open(cache_file, "w", encoding="utf-8") as f:
-      json.dump(courses_cache, f, ensure_ascii=False, indent=2)
-  except Exception:
-    pass
+    courses = list(iter_courses())
+  except Exception as e:
+    metrics.error("courses", e, account=current().name)
+    print(f"⚠️  Error obteniendo cursos: {e}", file=sys.stderr)
+    courses = []
+  else:
+    account.get_store().upsert_courses(courses)
 
-  return courses_cache
+  account.courses_cache = courses
+  return account.courses_cache
 
-@mcp.tool
+@tool
 def get_tasks(_params=None):
   """Return a flattened list of coursework (tasks).
 
   Supports optional params:
-  - courseName: search cached courses by name (substring, case-insensitive)
+  - courseName: search cached courses by name (accent-insensitive, aliases
+    and typos allowed; see matcher.py)
   - courseId: use this id directly
-  If no params given, returns tasks from all courses.
+  - orderBy: "dueDate asc", "updateTime desc", ... (Classroom orderBy syntax)
+  - limit: return at most this many tasks
+  - fields: projection in partial-response syntax (default TASK_FIELDS,
+    "*" for the whole stored resource)
+  - if_version: version of a previous result ("" for none); the result is
+    then wrapped with its version, or is a "notModified" marker if unchanged
+  - partial: send each course's tasks in its progress notification as soon
+    as it is synced (unsorted and unlimited; the final result is the answer)
+  If no params given, returns tasks from all courses. Tasks are served from
+  the local store after an incremental sync, reporting progress per course.
   """
-  global service
-  if service is None:
-    auth()
-
-  # helper to find course by name using cache
-  def find_course_by_name(name: str):
-    courses = fetch_courses() or []
-    if not name or not courses:
-      return None
-    q = name.strip().casefold()
-    # exact match first
-    for c in courses:
-      title = c.get("name") or c.get("title") or ""
-      if title and title.casefold() == q:
-        return c
-    # substring match
-    for c in courses:
-      title = c.get("name") or c.get("title") or ""
-      if title and q in title.casefold():
-        return c
-    return None
+  ensure_service()
 
   course_id = None
+  limit = None
+  order_by = None
+  fields = TASK_FIELDS
+  if_version = None
+  partial = False
   if isinstance(_params, dict):
+    fields = _params.get("fields", TASK_FIELDS)
+    if_version = _params.get("if_version")
+    partial = bool(_params.get("partial"))
+    if _params.get("limit"):
+      limit = int(_params.get("limit"))
+    order_by = _params.get("orderBy") or None
     if "courseId" in _params and _params.get("courseId"):
       course_id = str(_params.get("courseId"))
     elif "courseName" in _params and _params.get("courseName"):
-      found = find_course_by_name(_params.get("courseName"))
+      found = matcher_for(fetch_courses() or [], current().name).best(_params.get("courseName"))
       if found:
         course_id = str(found.get("id"))
 
-  tasks = []
+  # If course_id provided, sync only that course; otherwise all courses
+  course_ids = [course_id] if course_id else None
+  sync_with_progress(
+    course_ids, (lambda cid: project_all(get_store().coursework([cid]), fields)) if partial else None
+  )
+  tasks = get_store().coursework(course_ids)
 
-  # If course_id provided, fetch only that course's coursework
-  if course_id:
-    try:
-      resp = service.courses().courseWork().list(courseId=course_id).execute()
-      course_work = resp.get("courseWork", [])
-      if isinstance(course_work, list):
-        tasks.extend(course_work)
-    except Exception:
-      pass
-    return tasks
-
-  # Otherwise fetch for all courses
-  courses = fetch_courses() or []
-  for course in courses:
-    cid = course.get("id")
-    if not cid:
-      continue
-    try:
-      resp = service.courses().courseWork().list(courseId=str(cid)).execute()
-      course_work = resp.get("courseWork", [])
-      if isinstance(course_work, list):
-        tasks.extend(course_work)
-    except Exception:
+  if order_by:
+    tasks = sort_tasks(tasks, order_by)
+  return conditional(project_all(tasks[:limit] if limit else tasks, fields), if_version)
+
+@tool
+def query_tasks(
+  course_ids: list[str] | None = None,
+  course_names: list[str] | None = None,
+  due_after: str | None = None,
+  due_before: str | None = None,
+  work_types: list[str] | None = None,
+  states: list[str] | None = None,
+  text: str | None = None,
+  order_by: str | None = "dueDate asc",
+  limit: int | None = 50,
+  fields: str | None = TASK_FIELDS,
+  if_version: str | None = None,
+  partial: bool = False,
+):
+  """Return only the tasks matching the given filters.
+
+  - course_ids / course_names: restrict to these courses (names are matched
+    like get_tasks' courseName)
+  - due_after / due_before: inclusive due-date window, "YYYY-MM-DD" (whole
+    days in CLASSROOM_TIMEZONE) or an ISO datetime; tasks without a due date
+    are excluded when a window is given. Windows are read from the store's
+    due-date index instead of scanning every task
+  - work_types: e.g. ["ASSIGNMENT", "SHORT_ANSWER_QUESTION"]
+  - states: e.g. ["PUBLISHED"]
+  - text: accent-insensitive match on title and description
+  - order_by: "dueDate asc", "updateTime desc", "title", ...
+  - limit: maximum number of tasks returned
+  - fields: projection in partial-response syntax ("*" for everything)
+  - if_version: version of a previous result; unchanged results come back
+    as {"version", "notModified": true}
+  - partial: send each course's matching tasks with its progress notification
+  """
+  ensure_service()
+
+  selected = [str(c) for c in course_ids or []]
+  if course_names:
+    matcher = matcher_for(fetch_courses() or [], current().name)
+    for name in course_names:
+      found = matcher.best(name)
+      if found and str(found.get("id")) not in selected:
+        selected.append(str(found.get("id")))
+    if not selected:
+      return conditional([], if_version)
+
+  start, end = due_window(due_after, due_before)
+
+  def matching(course_ids):
+    st = get_store()
+    if start is None and end is None:
+      coursework = st.coursework(course_ids)
+    else:
+      coursework = st.coursework_due(start, end, course_ids)
+    return filter_tasks(coursework, work_types=work_types, states=states, text=text)
+
+  course_ids = selected or None
+  sync_with_progress(
+    course_ids,
+    (lambda cid: project_all(list(matching([cid])), fields)) if partial else None,
+  )
+  tasks = matching(course_ids)
+  tasks = sort_tasks(tasks, order_by) if order_by else list(tasks)
+  return conditional(project_all(tasks[:limit] if limit else tasks, fields), if_version)
+
+# Submission states that still need the student to turn something in.
+PENDING_STATES = ("NEW", "CREATED", "RECLAIMED_BY_STUDENT")
+SUBMISSION_FIELDS = "courseWorkId,state,late"
+
+
+def iter_submissions(course_id, fields=SUBMISSION_FIELDS):
+  """Stream my submissions for every courseWork of a course in one listing."""
+  return iter_items(
+    current().service.courses().courseWork().studentSubmissions().list,
+    execute,
+    "studentSubmissions",
+    COURSEWORK_PAGE_SIZE,
+    courseId=str(course_id),
+    courseWorkId="-",
+    userId="me",
+    fields=api_fields(fields, "studentSubmissions"),
+  )
+
+
+@tool
+def get_pending_tasks(
+  course_ids: list[str] | None = None,
+  include_late: bool = True,
+  fields: str | None = TASK_FIELDS + ",submissionState,late",
+  if_version: str | None = None,
+):
+  """Return the coursework I still have to turn in, soonest due first.
+
+  Submissions are listed once per course (courseWorkId="-") and joined with
+  the stored coursework locally. Each task gets `submissionState` and
+  `late`; set include_late=false to leave out work that is already late.
+  With `if_version` an unchanged result is just a "notModified" marker.
+  """
+  ensure_service()
+
+  sync_with_progress(course_ids)
+  coursework = {str(t.get("id")): t for t in get_store().coursework(course_ids)}
+  if course_ids is None:
+    course_ids = list(dict.fromkeys(str(t.get("courseId")) for t in coursework.values()))
+
+  pending = []
+  for r in fetch_all(lambda cid: list(iter_submissions(cid)), course_ids, executor=current().executor):
+    if not r.ok:
+      metrics.error("submissions", r.error, course_id=r.key, account=current().name)
+      print(f"⚠️  Error obteniendo entregas del curso {r.key}: {r.error}", file=sys.stderr)
       continue
+    for sub in r.value:
+      if sub.get("state") not in PENDING_STATES:
+        continue
+      if sub.get("late") and not include_late:
+        continue
+      task = coursework.get(str(sub.get("courseWorkId")))
+      if task is None:
+        continue
+      pending.append({**task, "submissionState": sub.get("state"), "late": bool(sub.get("late"))})
+
+  return conditional(project_all(sort_tasks(pending, "dueDate asc"), fields), if_version)
+
+
+@tool(per_account=False)
+def list_accounts():
+  """Return the accounts this server serves, with whether each one's service
+  is ready and how many courses it has cached. Pass a name as the `account`
+  argument of the other tools to work on that account."""
+  return [
+    {
+      "name": account.name,
+      "ready": account.service is not None,
+      "courses": len(account.courses_cache) if account.courses_cache is not None else None,
+    }
+    for account in registry
+  ]
+
+
+@tool(per_account=False)
+def sync_accounts(accounts: list[str] | None = None, max_workers: int | None = None):
+  """Sync the local store of every account (or only the named ones).
+
+  Accounts are synced in parallel, up to max_workers (default
+  CLASSROOM_ACCOUNT_WORKERS) at a time, each with its own service, store and
+  quota. Returns per account whether it succeeded, its course count, the
+  courses whose sync failed and how long it took.
+  """
+  selected = [registry.get(name) for name in accounts] if accounts else list(registry)
+
+  def sync(account):
+    start = time.perf_counter()
+    with using(account.name):
+      ensure_service()
+      failed = sync_store()
+      courses = len(account.get_store().courses())
+    return {"courses": courses, "failedCourses": failed, "seconds": round(time.perf_counter() - start, 3)}
+
+  summary = []
+  for r in fetch_all(sync, selected, max_workers or ACCOUNT_WORKERS):
+    if r.ok:
+      summary.append({"account": r.key.name, "ok": not r.value["failedCourses"], **r.value})
+    else:
+      metrics.error("sync_accounts", r.error, account=r.key.name)
+      summary.append({"account": r.key.name, "ok": False, "error": str(r.error)})
+  return summary
+
+
+@tool(per_account=False)
+def get_metrics(reset: bool = False):
+  """Return the server's metrics collected since start (or the last reset).
+
+  - timings: per tool ("tool.*"), per API method ("api.*"), per account and
+    course ("course.<account>.<id>"), auth refresh and service build; count,
+    errors, mean/max ms
+  - counters: HTTP requests and bytes received, cache and store hits/misses,
+    syncs, calls shared with an identical in-flight one ("singleflight.shared")
+    and errors by origin ("errors.*")
+  - hit_rates: hits / (hits + misses) per cache
+  - last_errors: the most recent errors with their course id when known
+  Set reset=true to start a new measurement window after reading.
+  """
+  snapshot = metrics.snapshot()
+  snapshot["counters"]["singleflight.shared"] = sum(a.inflight.shared + a.syncing.shared for a in registry)
+  if reset:
+    metrics.reset()
+    for account in registry:
+      account.inflight.shared = account.syncing.shared = 0
+  return snapshot
+
+def serve(transport="stdio", host=HTTP_HOST, port=HTTP_PORT):
+  """Run the MCP server, authenticating in the background while clients connect.
+
+  "stdio" serves the one client that spawned this process. "http" keeps a
+  long-lived server that many clients share, along with its credentials,
+  service, caches and store; clients connect to http://host:port/mcp and
+  GET /health reports whether every account's service is ready.
+  """
+  if not len(registry):
+    raise RuntimeError(
+      f"No token files found in {ACCOUNTS_DIR}; run `python main.py --accounts {ACCOUNTS_DIR} "
+      "--authorize --account NAME` first"
+    )
+  threading.Thread(target=warm_up, name="classroom-warm-up", daemon=True).start()
+  server = create_server()
+  if transport != "http":
+    server.run(transport="stdio")
+    return
+
+  from starlette.responses import JSONResponse
+
+  @server.custom_route("/health", methods=["GET"])
+  async def health(request):
+    ready = all(account.service is not None for account in registry)
+    return JSONResponse({"status": "ok", "service_ready": ready, "accounts": registry.names()})
+
+  server.run(transport="http", host=host, port=port, show_banner=False)
+
+
+def _arg(name, default):
+  """Value following a command-line flag (e.g. --port 8000), or default."""
+  if name in sys.argv[:-1]:
+    return sys.argv[sys.argv.index(name) + 1]
+  return default
 
-  return tasks
 
 def main():
-  global creds
-  creds = auth() 
-  
+  auth()
+
   cursos = getCourses()
   clases_todos_cursos = getClases(cursos)
 
   print(clases_todos_cursos)
 
 if __name__ == "__main__":
-  # If --authorize flag is present, run auth and exit
+  if "--accounts" in sys.argv:
+    ACCOUNTS_DIR = _arg("--accounts", ACCOUNTS_DIR)
+    load_accounts(ACCOUNTS_DIR)
+
+  # If --authorize flag is present, run auth and exit. With --account NAME
+  # (multi-account mode) the token is saved as <accounts dir>/NAME.json.
   if STANDALONE_AUTHORIZE:
     try:
-      auth()
-      print("✅ Autorización completada. Token guardado en token.json", file=sys.stderr)
+      name = _arg("--account", None)
+      if name is None:
+        if ACCOUNTS_DIR and not len(registry):
+          raise RuntimeError("no hay cuentas todavía; indica cuál autorizar con --account NOMBRE")
+        account = current()
+      else:
+        if not ACCOUNTS_DIR:
+          raise RuntimeError("--account requiere --accounts DIR o CLASSROOM_ACCOUNTS_DIR")
+        os.makedirs(ACCOUNTS_DIR, exist_ok=True)
+        account = Account(
+          name, os.path.join(ACCOUNTS_DIR, f"{name}.json"), os.path.join(ACCOUNTS_DIR, f"{name}.db")
+        )
+      auth(account)
+      print(f"✅ Autorización completada. Token guardado en {account.token_path}", file=sys.stderr)
     except Exception as e:
       print(f"❌ Error durante autorización: {e}", file=sys.stderr)
       sys.exit(1)
     sys.exit(0)
   
-  # Otherwise start the MCP server
-  mcp.run(transport="stdio")
+  # Otherwise start the MCP server: over stdio for the client that spawned
+  # us, or with --http as a long-lived server shared by many clients
+  if "--http" in sys.argv:
+    serve("http", _arg("--host", HTTP_HOST), int(_arg("--port", HTTP_PORT)))
+  else:
+    serve("stdio")
 
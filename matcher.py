@@ -0,0 +1,146 @@
+"""Course name matching shared by the MCP server and the chat client.
+
+A CourseMatcher indexes one course list: accent-insensitive name tokens, an
+alias table for subject names ("mate", "english", ...) and a trigram index
+over the tokens to tolerate typos. ``matcher_for`` keeps the index of the
+latest course list of each owner (account), so it is built once per list
+version and every lookup afterwards only touches the index.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Iterable
+
+from router import normalize
+
+# Subject aliases (normalized). A query mentioning any term of a group
+# matches courses whose name contains any term of the same group.
+ALIASES = {
+    "ingles": ["ingles", "english"],
+    "espanol": ["espanol", "lengua espanola", "lengua", "castellano"],
+    "matematicas": ["matematicas", "matematica", "mate", "math", "maths"],
+    "ciencias": ["ciencias sociales", "ciencias", "sociales"],
+    "informatica": ["informatica", "tecnologia", "computacion"],
+}
+
+# Words that never identify a course on their own.
+STOPWORDS = frozenset(
+    "a al con cual cuales de del el en es hay la las lo los mi mis para por que "
+    "se sus tengo un una y clase clases curso cursos materia tarea tareas "
+    "trabajo trabajos pendiente pendientes".split()
+)
+
+TYPO_SIMILARITY = 0.4
+
+
+def _tokens(text: str) -> list[str]:
+    return [t for t in normalize(text).split() if len(t) > 2 and t not in STOPWORDS and not t.isdigit()]
+
+
+def _trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _course_name(course: dict) -> str:
+    return course.get("name") or course.get("title") or ""
+
+
+class CourseMatcher:
+    def __init__(self, courses: Iterable[dict], aliases: dict[str, list[str]] = ALIASES):
+        self.courses = [c for c in courses if isinstance(c, dict)]
+        self.names = [f" {normalize(_course_name(c))} " for c in self.courses]
+        self.exact = {name.strip(): i for i, name in reversed(list(enumerate(self.names))) if name.strip()}
+        self.name_tokens = [set(_tokens(_course_name(c))) for c in self.courses]
+
+        self.by_token: dict[str, set[int]] = defaultdict(set)
+        for i, tokens in enumerate(self.name_tokens):
+            for token in tokens:
+                self.by_token[token].add(i)
+
+        self.by_trigram: dict[str, set[str]] = defaultdict(set)
+        for token in self.by_token:
+            for gram in _trigrams(token):
+                self.by_trigram[gram].add(token)
+
+        self.aliases = [[f" {normalize(term)} " for term in terms] for terms in aliases.values()]
+        self.by_alias: list[set[int]] = [
+            {i for i, name in enumerate(self.names) if any(term in name for term in terms)}
+            for terms in self.aliases
+        ]
+
+    def _similar_tokens(self, token: str) -> list[str]:
+        grams = _trigrams(token)
+        counts = defaultdict(int)
+        for gram in grams:
+            for candidate in self.by_trigram.get(gram, ()):
+                counts[candidate] += 1
+        return [
+            candidate
+            for candidate, common in counts.items()
+            if common / len(grams | _trigrams(candidate)) >= TYPO_SIMILARITY
+        ]
+
+    def match(self, query: str) -> list[dict]:
+        """Courses matching a course name or a free-text question, best first.
+
+        An exact name match wins outright. Otherwise courses score for: their
+        whole name appearing in the query or the query appearing in their
+        name, shared name tokens (typos allowed), and subject aliases.
+        """
+        normalized = normalize(query or "")
+        if not normalized or not self.courses:
+            return []
+        if normalized in self.exact:
+            return [self.courses[self.exact[normalized]]]
+
+        padded = f" {normalized} "
+        scores: dict[int, float] = defaultdict(float)
+        for i, name in enumerate(self.names):
+            if name.strip() and (name in padded or normalized in name):
+                scores[i] += 3.0
+
+        for token in set(_tokens(query)):
+            hits = self.by_token.get(token)
+            if hits:
+                for i in hits:
+                    scores[i] += 1.0
+            elif len(token) >= 4:
+                for similar in self._similar_tokens(token):
+                    for i in self.by_token[similar]:
+                        scores[i] += 0.8
+
+        for terms, hits in zip(self.aliases, self.by_alias):
+            if any(term in padded for term in terms):
+                for i in hits:
+                    scores[i] += 1.0
+
+        ranked = sorted(
+            scores,
+            key=lambda i: (-scores[i], self.courses[i].get("courseState") != "ACTIVE", i),
+        )
+        return [self.courses[i] for i in ranked]
+
+    def best(self, query: str) -> dict | None:
+        """The single best match for a course name, or None."""
+        found = self.match(query)
+        return found[0] if found else None
+
+
+_lock = threading.Lock()
+_cached: dict[str | None, tuple[tuple, CourseMatcher]] = {}
+
+
+def matcher_for(courses: Iterable[dict], owner: str | None = None) -> CourseMatcher:
+    """Matcher for this course list, rebuilt only when the list changes.
+
+    One matcher is kept per owner (e.g. the account the list belongs to), so
+    callers alternating between course lists don't rebuild each other's.
+    """
+    courses = [c for c in courses if isinstance(c, dict)]
+    version = tuple((str(c.get("id")), _course_name(c), c.get("courseState")) for c in courses)
+    with _lock:
+        cached = _cached.get(owner)
+        if cached is None or cached[0] != version:
+            cached = _cached[owner] = (version, CourseMatcher(courses))
+        return cached[1]
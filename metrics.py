@@ -0,0 +1,122 @@
+"""In-process metrics for the MCP server.
+
+Counters and timing summaries are kept in memory (thread-safe) and exposed
+through the ``get_metrics`` tool. With CLASSROOM_METRICS_LOG=1 every
+recorded event is also written to stderr as one JSON object per line, so
+stdout stays reserved for the MCP stdio framing.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import defaultdict
+from contextlib import contextmanager
+
+LOG_EVENTS = os.environ.get("CLASSROOM_METRICS_LOG") == "1"
+
+
+class Timing:
+    __slots__ = ("count", "total", "max", "errors")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def add(self, seconds: float, ok: bool = True):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if not ok:
+            self.errors += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class Metrics:
+    def __init__(self, log_events: bool = LOG_EVENTS):
+        self.log_events = log_events
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.counters: dict[str, float] = defaultdict(float)
+            self.timings: dict[str, Timing] = defaultdict(Timing)
+            self.last_errors: list[dict] = []
+
+    def log(self, event: str, **fields):
+        if self.log_events:
+            record = {"ts": round(time.time(), 3), "event": event, **fields}
+            print(json.dumps(record, ensure_ascii=False, default=str), file=sys.stderr, flush=True)
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def observe(self, name: str, seconds: float, ok: bool = True):
+        with self._lock:
+            self.timings[name].add(seconds, ok)
+
+    def error(self, where: str, exc: BaseException, **context):
+        """Count an error and keep its trace instead of swallowing it silently."""
+        record = {
+            "where": where,
+            "type": type(exc).__name__,
+            "message": str(exc),
+            **context,
+        }
+        with self._lock:
+            self.counters[f"errors.{where}"] += 1
+            self.last_errors.append({**record, "ts": round(time.time(), 3)})
+            del self.last_errors[:-20]
+        self.log("error", **record, trace=traceback.format_exception(exc)[-3:])
+
+    @contextmanager
+    def timer(self, name: str, **fields):
+        """Time a block under ``name``; failures are counted and re-raised."""
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe(name, elapsed, ok)
+            self.log("timing", name=name, ms=round(elapsed * 1000, 3), ok=ok, **fields)
+
+    def hit_rate(self, prefix: str) -> float | None:
+        hits = self.counters.get(f"{prefix}.hits", 0)
+        misses = self.counters.get(f"{prefix}.misses", 0)
+        return round(hits / (hits + misses), 4) if hits + misses else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {k: v for k, v in sorted(self.counters.items())}
+            timings = {k: t.as_dict() for k, t in sorted(self.timings.items())}
+            errors = list(self.last_errors)
+        prefixes = {k.rsplit(".", 1)[0] for k in counters if k.endswith((".hits", ".misses"))}
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "counters": counters,
+            "timings": timings,
+            "hit_rates": {p: self.hit_rate(p) for p in sorted(prefixes)},
+            "last_errors": errors,
+        }
+
+
+metrics = Metrics()
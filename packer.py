@@ -0,0 +1,125 @@
+"""Token-budget-aware packing of tasks into the LLM payload.
+
+Instead of cutting the task list at a fixed count and waiting for the model
+to reject an oversized request, the packer estimates the token cost of each
+task locally and fills a token budget greedily in priority order. Each
+task's encoded fragment is cached, so repeated questions over the same tasks
+don't re-encode them.
+
+The payload is a TOON list of objects (``[N]:`` followed by ``- key: value``
+items); fragments are produced by the TOON ``encode`` the client already
+uses, one task at a time.
+"""
+
+import datetime
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+
+from deadlines import TIMEZONE, local_label
+from records import due_of, is_task
+
+# Input tokens available for the task payload (the model's request limit
+# minus room for the system prompt and the answer).
+DEFAULT_TOKEN_BUDGET = int(os.environ.get("PAYLOAD_TOKEN_BUDGET", "6000"))
+# Conservative characters-per-token ratio for Spanish text in TOON.
+CHARS_PER_TOKEN = 3.2
+DESCRIPTION_CHARS = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough local token estimate: a little pessimistic on purpose."""
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def compact_task(t: dict) -> dict:
+    """The fields of a task the summary actually needs, without empties."""
+    task_info = {
+        "courseName": t.get("courseName", "Sin curso"),
+        "title": t.get("title") or t.get("name") or "Sin título",
+        "description": (t.get("description") or "")[:DESCRIPTION_CHARS],
+        # "YYYY-MM-DD HH:MM" in the user's time zone instead of the raw
+        # UTC dueDate/dueTime dicts the model would have to interpret.
+        "due": local_label(due_of(t)),
+    }
+    return {k: v for k, v in task_info.items() if v}
+
+
+def due_priority(today: datetime.date | None = None) -> Callable[[dict], tuple]:
+    """Priority key: upcoming due dates soonest first, then undated, then past due."""
+    today = today or datetime.datetime.now(TIMEZONE).date()
+
+    def key(t: dict) -> tuple:
+        due = due_of(t)
+        if due is None:
+            return (1, 0)
+        due = due.astimezone(TIMEZONE).date()
+        if due >= today:
+            return (0, (due - today).days)
+        return (2, (today - due).days)
+
+    return key
+
+
+class PayloadPacker:
+    def __init__(
+        self,
+        encode: Callable[[Any], str],
+        budget: int = DEFAULT_TOKEN_BUDGET,
+        max_fragments: int = 10000,
+    ):
+        self.encode = encode
+        self.budget = budget
+        self.max_fragments = max_fragments
+        self._fragments: OrderedDict[tuple, tuple[str, int]] = OrderedDict()
+        self.fragment_hits = 0
+        self.fragment_misses = 0
+
+    def fragment(self, task: dict) -> tuple[str, int]:
+        """Encoded list item for a task and its estimated token cost (cached)."""
+        info = compact_task(task)
+        key = (task.get("id"), task.get("updateTime"), repr(sorted(info.items())))
+        cached = self._fragments.get(key)
+        if cached is not None:
+            self.fragment_hits += 1
+            self._fragments.move_to_end(key)
+            return cached
+
+        self.fragment_misses += 1
+        lines = self.encode(info).splitlines() or ["{}"]
+        text = "\n".join(
+            ["  - " + lines[0]] + ["    " + line for line in lines[1:]]
+        )
+        cached = (text, estimate_tokens(text) + 1)
+        self._fragments[key] = cached
+        while len(self._fragments) > self.max_fragments:
+            self._fragments.popitem(last=False)
+        return cached
+
+    def pack(
+        self,
+        tasks: Iterable[dict],
+        budget: int | None = None,
+        priority: Callable[[dict], Any] | None = None,
+    ) -> tuple[str, int]:
+        """Fill the token budget with tasks; return (payload, tasks included).
+
+        Tasks are taken in priority order (input order when None) and any
+        task that no longer fits is skipped so smaller ones can still use
+        the remaining budget.
+        """
+        budget = self.budget if budget is None else budget
+        tasks = [t for t in tasks if is_task(t)]
+        if priority is not None:
+            tasks = sorted(tasks, key=priority)
+
+        remaining = budget - estimate_tokens("[0000]:")
+        chosen = []
+        for task in tasks:
+            text, cost = self.fragment(task)
+            if cost <= remaining:
+                chosen.append(text)
+                remaining -= cost
+        if not chosen:
+            return "[0]:", 0
+        return f"[{len(chosen)}]:\n" + "\n".join(chosen), len(chosen)
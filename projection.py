@@ -0,0 +1,138 @@
+"""Field projections for Classroom resources.
+
+A projection uses the Google partial-response syntax (``"title,dueDate"``,
+``"materials/link/url"``, ``"dueDate(year,month)"``). The same projection is
+pushed down to the API as the ``fields=`` parameter, so unused parts of each
+resource never cross the wire, and applied again to tool results so the MCP
+message only carries what the caller asked for.
+"""
+
+from typing import Any
+
+# Compact default for task-listing tools: enough to identify, describe and
+# schedule a task without materials, assignee lists or links. updateTime lets
+# clients tell a changed task from one they already hold (and indexed).
+TASK_FIELDS = "id,courseId,title,description,dueDate,dueTime,workType,state,updateTime"
+
+_SEPARATORS = ",()/"
+
+
+def _set(tree: dict, path: list[str], sub: dict | None):
+    """Add ``path`` (with optional sub-selection) to ``tree``."""
+    node = tree
+    for part in path[:-1]:
+        if part in node and node[part] is None:
+            return  # the whole parent is already selected
+        node = node.setdefault(part, {})
+    last = path[-1]
+    if sub is None or node.get(last, {}) is None:
+        node[last] = None
+    else:
+        existing = node.setdefault(last, {})
+        for name, value in sub.items():
+            _set(existing, [name], value)
+
+
+def _parse(spec: str, pos: int, tree: dict, nested: bool) -> int:
+    while pos < len(spec):
+        path = []
+        while True:
+            end = pos
+            while end < len(spec) and spec[end] not in _SEPARATORS:
+                end += 1
+            if end == pos:
+                raise ValueError(f"invalid fields projection: {spec!r}")
+            path.append(spec[pos:end])
+            pos = end
+            if pos < len(spec) and spec[pos] == "/":
+                pos += 1
+                continue
+            break
+
+        sub = None
+        if pos < len(spec) and spec[pos] == "(":
+            sub = {}
+            pos = _parse(spec, pos + 1, sub, nested=True)
+        _set(tree, path, sub)
+
+        if pos < len(spec) and spec[pos] == ",":
+            pos += 1
+        elif pos < len(spec) and spec[pos] == ")":
+            if not nested:
+                raise ValueError(f"unbalanced ')' in fields projection: {spec!r}")
+            return pos + 1
+    if nested:
+        raise ValueError(f"unbalanced '(' in fields projection: {spec!r}")
+    return pos
+
+
+def parse_fields(fields) -> dict | None:
+    """Parse a projection into a tree of ``{name: subtree or None}``.
+
+    Accepts a comma-separated string or a list of paths. ``None``, ``""`` and
+    ``"*"`` mean "everything" and return None.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, dict):
+        return fields
+    if isinstance(fields, (list, tuple)):
+        fields = ",".join(fields)
+    spec = "".join(str(fields).split())
+    if spec in ("", "*"):
+        return None
+    tree = {}
+    _parse(spec, 0, tree, nested=False)
+    return tree
+
+
+def format_fields(tree: dict) -> str:
+    """Serialize a parsed projection back to partial-response syntax."""
+    return ",".join(
+        name if sub is None else f"{name}({format_fields(sub)})"
+        for name, sub in tree.items()
+    )
+
+
+def merge_fields(*projections) -> dict | None:
+    """Union of several projections; None (everything) wins."""
+    merged = {}
+    for fields in projections:
+        tree = parse_fields(fields)
+        if tree is None:
+            return None
+        for name, sub in tree.items():
+            _set(merged, [name], sub)
+    return merged
+
+
+def api_fields(fields, items_key: str) -> str | None:
+    """``fields=`` value for a list call returning ``items_key`` items."""
+    tree = parse_fields(fields)
+    if tree is None:
+        return None
+    return f"nextPageToken,{items_key}({format_fields(tree)})"
+
+
+def project(item: Any, fields) -> Any:
+    """Keep only the projected fields of a resource (recursing into lists)."""
+    tree = parse_fields(fields)
+    if tree is None:
+        return item
+    if isinstance(item, list):
+        return [project(i, tree) for i in item]
+    if not isinstance(item, dict):
+        return item
+    out = {}
+    for name, sub in tree.items():
+        if name in item:
+            out[name] = item[name] if sub is None else project(item[name], sub)
+    return out
+
+
+def project_all(items: list, fields) -> list:
+    """Project every dict in ``items``; other entries pass through unchanged."""
+    tree = parse_fields(fields)
+    if tree is None:
+        return items
+    return [project(i, tree) if isinstance(i, dict) else i for i in items]
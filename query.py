@@ -0,0 +1,106 @@
+"""Filtering and sorting of coursework for the query tools.
+
+Pushing filters into the server means only matching tasks are serialized
+and sent over stdio. ``time_window`` turns the usual Spanish time phrases
+("hoy", "esta semana", ...) into a due-date range so the client can ask for
+exactly that window.
+"""
+
+import datetime
+from typing import Iterable, Iterator
+
+from deadlines import TIMEZONE, due_timestamp, due_window
+from router import normalize
+
+
+def sort_tasks(tasks, order_by):
+    """Sort merged coursework the way Classroom's orderBy would per course.
+
+    Supports "dueDate" plus any top-level field ("updateTime", "title", ...)
+    with an optional "asc"/"desc" direction. Tasks without a due date go
+    last when sorting by dueDate.
+    """
+    field, _, direction = order_by.strip().partition(" ")
+    reverse = direction.strip().lower() == "desc"
+    if field == "dueDate":
+        def due_key(t):
+            d = t.get("dueDate") or {}
+            tm = t.get("dueTime") or {}
+            return (d.get("year", 0), d.get("month", 0), d.get("day", 0), tm.get("hours", 0), tm.get("minutes", 0))
+
+        dated = [t for t in tasks if t.get("dueDate")]
+        undated = [t for t in tasks if not t.get("dueDate")]
+        return sorted(dated, key=due_key, reverse=reverse) + undated
+    return sorted(tasks, key=lambda t: str(t.get(field) or ""), reverse=reverse)
+
+
+def filter_tasks(
+    tasks: Iterable[dict],
+    course_ids: Iterable[str] | None = None,
+    due_after=None,
+    due_before=None,
+    work_types: Iterable[str] | None = None,
+    states: Iterable[str] | None = None,
+    text: str | None = None,
+) -> Iterator[dict]:
+    """Yield the tasks matching every given filter.
+
+    The due window is inclusive and in calendar days of the user's time zone
+    (see deadlines.due_window); when one is given, tasks without a due date
+    are left out. ``text`` is matched accent- and case-insensitively
+    against title and description.
+    """
+    course_ids = {str(c) for c in course_ids} if course_ids else None
+    work_types = {w.upper() for w in work_types} if work_types else None
+    states = {s.upper() for s in states} if states else None
+    start, end = due_window(due_after, due_before)
+    needle = normalize(text) if text else None
+
+    for task in tasks:
+        if not isinstance(task, dict):
+            continue
+        if course_ids is not None and str(task.get("courseId")) not in course_ids:
+            continue
+        if work_types is not None and (task.get("workType") or "").upper() not in work_types:
+            continue
+        if states is not None and (task.get("state") or "").upper() not in states:
+            continue
+        if start is not None or end is not None:
+            due = due_timestamp(task)
+            if due is None or (start is not None and due < start) or (end is not None and due >= end):
+                continue
+        if needle and needle not in normalize(f"{task.get('title') or ''} {task.get('description') or ''}"):
+            continue
+        yield task
+
+
+def time_window(text: str, today: datetime.date | None = None):
+    """Due-date range (start, end) mentioned in a question, or None.
+
+    Understands "hoy", "mañana", "pasado mañana", "esta semana", "la
+    próxima semana", "este mes" and "atrasadas/vencidas" (anything due
+    before today).
+    """
+    today = today or datetime.datetime.now(TIMEZONE).date()
+    t = f" {normalize(text)} "
+    monday = today - datetime.timedelta(days=today.weekday())
+
+    if " pasado manana " in t:
+        day = today + datetime.timedelta(days=2)
+        return day, day
+    if " manana " in t:
+        day = today + datetime.timedelta(days=1)
+        return day, day
+    if " hoy " in t:
+        return today, today
+    if " la proxima semana " in t:
+        start = monday + datetime.timedelta(days=7)
+        return start, start + datetime.timedelta(days=6)
+    if " esta semana " in t:
+        return today, monday + datetime.timedelta(days=6)
+    if " este mes " in t:
+        next_month = (today.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        return today, next_month - datetime.timedelta(days=1)
+    if any(p in t for p in (" atrasad", " vencid")):
+        return None, today - datetime.timedelta(days=1)
+    return None
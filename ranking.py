@@ -0,0 +1,275 @@
+"""Relevance ranking of tasks against the user's question (BM25).
+
+Instead of sending the model whichever tasks come first, the chat client
+ranks them against the question and packs only the best ``k``.
+``TaskIndex`` is a BM25 index over each task's title and description
+(title terms count double) plus, as a separate field with its own length
+normalization, its course name: every task of a course gets the same boost
+for a course mentioned in the question, so those ties keep the caller's
+order (e.g. soonest due first).
+
+Postings are appended per term as tasks arrive and turned into NumPy arrays
+when a query needs them, so a query only touches the tasks containing its
+terms and scores them in a few vectorized operations. A task seen again with
+a new ``updateTime`` replaces its previous version.
+"""
+
+import math
+from typing import Iterable
+
+import numpy as np
+
+from matcher import ALIASES, STOPWORDS
+from records import is_task
+from router import normalize
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2.0
+DESCRIPTION_CHARS = 2000
+
+# Question words that say nothing about which task is meant.
+QUERY_STOPWORDS = STOPWORDS | frozenset(
+    "algo alguna algun como cuando cuanto cuantos debo dime donde esa ese eso esta estas este "
+    "esto estos hacer hasta desde entregar entrega entregas hoy manana mas muestra muy pero "
+    "proxima proximo quien semana sobre son tiene tienen todas todos una uno unas unos ver "
+    "the and for with what about".split()
+)
+
+
+def _stem(token: str) -> str:
+    """Crude Spanish plural folding: ecuaciones -> ecuacion, celulas -> celula."""
+    if token.endswith("iones"):
+        return token[:-2]
+    if token.endswith("s") and len(token) > 4:
+        return token[:-1]
+    return token
+
+
+def terms(text: str) -> list[str]:
+    """Index terms of a text: normalized, without stopwords, plurals folded."""
+    return [
+        _stem(t) for t in normalize(text or "").split()
+        if len(t) > 2 and t not in QUERY_STOPWORDS and not t.isdigit()
+    ]
+
+
+def query_terms(question: str) -> set[str]:
+    """Terms of a question, plus every subject alias it mentions."""
+    found = set(terms(question))
+    padded = f" {normalize(question or '')} "
+    for group in ALIASES.values():
+        if any(f" {term} " in padded for term in group):
+            for term in group:
+                found.update(terms(term))
+    return found
+
+
+class _Field:
+    """Postings and document lengths of one indexed field."""
+
+    def __init__(self):
+        self.vocab: dict[str, int] = {}
+        self.postings: list[tuple[list[int], list[float]]] = []
+        self.df: list[int] = []
+        self.lengths = np.zeros(0)
+        self.total_length = 0.0
+        self._arrays: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    def add(self, doc: int, weighted: dict[str, float]) -> list[int]:
+        if doc >= len(self.lengths):
+            self.lengths = np.resize(self.lengths, max(1024, 2 * len(self.lengths)))
+        length = sum(weighted.values())
+        self.lengths[doc] = length
+        self.total_length += length
+        ids = []
+        for term, tf in weighted.items():
+            tid = self.vocab.get(term)
+            if tid is None:
+                tid = self.vocab[term] = len(self.postings)
+                self.postings.append(([], []))
+                self.df.append(0)
+            docs, tfs = self.postings[tid]
+            docs.append(doc)
+            tfs.append(tf)
+            self.df[tid] += 1
+            self._arrays.pop(tid, None)
+            ids.append(tid)
+        return ids
+
+    def remove(self, doc: int, ids: list[int]):
+        # Postings of removed documents stay until compaction; they are
+        # masked out when scoring and no longer count towards df.
+        self.total_length -= self.lengths[doc]
+        for tid in ids:
+            self.df[tid] -= 1
+
+    def score(self, query: Iterable[str], scores: np.ndarray, live: int):
+        if not live:
+            return
+        avg_length = max(self.total_length / live, 1e-9)
+        for term in query:
+            tid = self.vocab.get(term)
+            if tid is None or not self.df[tid]:
+                continue
+            arrays = self._arrays.get(tid)
+            if arrays is None:
+                docs, tfs = self.postings[tid]
+                arrays = self._arrays[tid] = (np.array(docs, dtype=np.intp), np.array(tfs))
+            docs, tfs = arrays
+            df = self.df[tid]
+            idf = math.log(1 + (live - df + 0.5) / (df + 0.5))
+            norm = tfs + K1 * (1 - B + B * self.lengths[docs] / avg_length)
+            # A document has one posting per term, so plain indexing adds safely.
+            scores[docs] += idf * tfs * (K1 + 1) / norm
+
+
+def _weighted(*parts: tuple[str, float]) -> dict[str, float]:
+    counts: dict[str, float] = {}
+    for text, weight in parts:
+        for term in terms(text):
+            counts[term] = counts.get(term, 0.0) + weight
+    return counts
+
+
+def _key(task: dict):
+    return (str(task.get("courseId")), str(task.get("id")))
+
+
+def _version(task: dict, course_name: str):
+    """What a task's postings depend on: its updateTime, or (for results
+    projected without it) the indexed text itself."""
+    return task.get("updateTime") or (
+        task.get("title") or "", (task.get("description") or "")[:DESCRIPTION_CHARS], course_name
+    )
+
+
+class TaskIndex:
+    def __init__(self):
+        self._text = _Field()
+        self._course = _Field()
+        self._tasks: list[dict | None] = []
+        self._course_names: list[str] = []
+        self._terms: list[tuple[list[int], list[int]]] = []
+        self._by_key: dict[tuple, int] = {}
+        # id() of each indexed task object, so ranking the same objects
+        # again skips building their keys (checked with `is` before use).
+        self._by_object: dict[int, int] = {}
+        self._versions: dict[tuple, object] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self.live = 0
+
+    def __len__(self):
+        return self.live
+
+    def add(self, task: dict, course_name: str | None = None) -> bool:
+        """Index a task (or its newer version); returns False if already indexed."""
+        key = _key(task)
+        course_name = course_name or task.get("courseName") or ""
+        version = _version(task, course_name)
+        old = self._by_key.get(key)
+        if old is not None:
+            if self._versions.get(key) == version:
+                # Same content in a new object (e.g. a refreshed list): keep
+                # the newest object so the fast lookup finds it.
+                self._by_object.pop(id(self._tasks[old]), None)
+                self._tasks[old] = task
+                self._by_object[id(task)] = old
+                return False
+            self._remove(old)
+
+        doc = len(self._tasks)
+        if doc >= len(self._alive):
+            self._alive = np.resize(self._alive, max(1024, 2 * len(self._alive)))
+        text = self._text.add(doc, _weighted(
+            (task.get("title") or "", TITLE_WEIGHT),
+            ((task.get("description") or "")[:DESCRIPTION_CHARS], 1.0),
+        ))
+        course = self._course.add(doc, _weighted((course_name, 1.0)))
+        self._tasks.append(task)
+        self._course_names.append(course_name)
+        self._terms.append((text, course))
+        self._alive[doc] = True
+        self._by_key[key] = doc
+        self._by_object[id(task)] = doc
+        self._versions[key] = version
+        self.live += 1
+        if len(self._tasks) > 1024 and len(self._tasks) > 2 * self.live:
+            self._compact()
+        return True
+
+    def add_all(self, tasks: Iterable[dict], course_names: dict[str, str] | None = None) -> int:
+        """Index several tasks; course_names maps courseId to its name. Returns
+        how many were new or changed."""
+        course_names = course_names or {}
+        return sum(
+            self.add(t, course_names.get(str(t.get("courseId"))))
+            for t in tasks if is_task(t)
+        )
+
+    def _doc(self, task: dict) -> int:
+        doc = self._by_object.get(id(task))
+        if doc is None or self._tasks[doc] is not task:
+            doc = self._by_key[_key(task)]
+        return doc
+
+    def _remove(self, doc: int):
+        self._by_object.pop(id(self._tasks[doc]), None)
+        text, course = self._terms[doc]
+        self._text.remove(doc, text)
+        self._course.remove(doc, course)
+        self._alive[doc] = False
+        self._tasks[doc] = None
+        self.live -= 1
+
+    def _compact(self):
+        """Rebuild without the postings of replaced tasks."""
+        tasks = [(t, name) for t, name in zip(self._tasks, self._course_names) if t is not None]
+        self.__init__()
+        for task, name in tasks:
+            self.add(task, name)
+
+    def scores(self, question: str) -> np.ndarray:
+        """BM25 score of every document slot for the question (0 = no match)."""
+        n = len(self._tasks)
+        scores = np.zeros(n)
+        query = query_terms(question)
+        if query and self.live:
+            self._text.score(query, scores, self.live)
+            self._course.score(query, scores, self.live)
+            scores[~self._alive[:n]] = 0.0
+        return scores
+
+    def top(self, question: str, k: int = 10) -> list[tuple[dict, float]]:
+        """The k best matching indexed tasks with their scores, best first."""
+        scores = self.scores(question)
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(self._tasks[i], float(scores[i])) for i in hits]
+
+    def rank(
+        self,
+        question: str,
+        tasks: list[dict],
+        k: int | None = None,
+        course_names: dict[str, str] | None = None,
+    ) -> list[dict]:
+        """Those of tasks that match the question, most relevant first.
+
+        Tasks not indexed yet are added first. Equal scores keep the order of
+        tasks, so pass them in the order wanted for ties. At most k are
+        returned; an empty list means the question matched none of them.
+        """
+        tasks = [t for t in tasks if is_task(t)]
+        course_names = course_names or {}
+        for task in tasks:
+            doc = self._by_object.get(id(task))
+            if doc is None or self._tasks[doc] is not task:
+                self.add(task, course_names.get(str(task.get("courseId"))))
+        docs = np.fromiter((self._doc(t) for t in tasks), dtype=np.intp, count=len(tasks))
+        candidate = self.scores(question)[docs]
+        hits = np.flatnonzero(candidate > 0)
+        hits = hits[np.argsort(-candidate[hits], kind="stable")][:k]
+        return [tasks[i] for i in hits]
@@ -0,0 +1,112 @@
+"""Compact in-memory coursework records for the client.
+
+The client used to keep every task as the courseWork dict decoded from the
+MCP payload (nested dueDate/dueTime objects, materials, links, ...) and tag
+it with its course name in place. A ``TaskRecord`` keeps only the fields the
+answer pipeline reads, in ``__slots__``: the strings many tasks repeat
+(course id and name, work type, state) are interned so they share one copy,
+and the deadline is normalized once to POSIX seconds. The rest of the
+resource is kept as a single UTF-8 JSON blob and decoded only when asked for
+(``raw``, or ``get`` of a field that is not a column).
+
+Records answer ``get`` with the API field names, so packer and ranking take
+them wherever they take task dicts; ``courseName`` is a column filled in
+when the record is built, not a key written into the resource. deadlines.py
+only reads dicts: ``due_of``/``due_seconds`` give the deadline of either,
+and ``DueIndex(due=due_seconds)`` indexes records.
+"""
+
+import datetime
+import json
+import sys
+from typing import Any, Callable, Iterable
+
+from deadlines import UTC, due_at, due_timestamp
+
+# API field -> slot, for the fields kept as columns.
+COLUMNS = {
+    "id": "id",
+    "courseId": "course_id",
+    "title": "title",
+    "description": "description",
+    "workType": "work_type",
+    "state": "state",
+    "updateTime": "update_time",
+}
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class TaskRecord:
+    """One courseWork item: pipeline fields as attributes, the rest lazily."""
+
+    __slots__ = (*COLUMNS.values(), "course_name", "due", "_rest")
+
+    def __init__(self, item: dict, course_name: str | None = None):
+        rest = dict(item)
+        pop = rest.pop
+        self.id = pop("id", None)
+        course_id = pop("courseId", None)
+        self.course_id = None if course_id is None else sys.intern(str(course_id))
+        self.title = pop("title", None)
+        self.description = pop("description", None)
+        self.work_type = _intern(pop("workType", None))
+        self.state = _intern(pop("state", None))
+        self.update_time = pop("updateTime", None)
+        self.course_name = _intern(course_name)
+        self.due = due_timestamp(item)
+        self._rest = _encode(rest).encode() if rest else None
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Field by its API name (plus "courseName"), like dict.get."""
+        slot = "course_name" if name == "courseName" else COLUMNS.get(name)
+        if slot is not None:
+            value = getattr(self, slot)
+            return default if value is None else value
+        if self._rest is None:
+            return default
+        return json.loads(self._rest).get(name, default)
+
+    @property
+    def due_at(self) -> datetime.datetime | None:
+        """The deadline as an aware UTC datetime (see deadlines.due_at)."""
+        return None if self.due is None else datetime.datetime.fromtimestamp(self.due, UTC)
+
+    @property
+    def raw(self) -> dict:
+        """The full courseWork resource, decoded on demand (without courseName)."""
+        item = {field: getattr(self, slot) for field, slot in COLUMNS.items() if getattr(self, slot) is not None}
+        if self._rest is not None:
+            item.update(json.loads(self._rest))
+        return item
+
+    def __repr__(self):
+        return f"TaskRecord(courseId={self.course_id!r}, id={self.id!r}, title={self.title!r})"
+
+
+def is_task(obj) -> bool:
+    """Whether obj is a task the pipeline can use: a courseWork dict or a record."""
+    return isinstance(obj, (dict, TaskRecord))
+
+
+def due_of(task) -> datetime.datetime | None:
+    """deadlines.due_at of a task dict, or a record's precomputed deadline."""
+    return task.due_at if isinstance(task, TaskRecord) else due_at(task)
+
+
+def due_seconds(task) -> float | None:
+    """deadlines.due_timestamp of a task dict or a record."""
+    return task.due if isinstance(task, TaskRecord) else due_timestamp(task)
+
+
+def to_records(items: Iterable, course_name: Callable[[str], str | None] | None = None) -> list[TaskRecord]:
+    """Records for the task dicts in items (anything else is skipped);
+    course_name(courseId) gives the name stored with each."""
+    return [
+        TaskRecord(item, course_name(str(item.get("courseId", ""))) if course_name else None)
+        for item in items
+        if isinstance(item, dict)
+    ]
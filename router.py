@@ -0,0 +1,84 @@
+"""Offline intent router for the chat client.
+
+Decides whether a question is about Classroom (tasks, courses, due dates)
+without an LLM round trip. It is a weighted keyword model seeded from the
+same Spanish examples as client.SYSTEM_PROMPT: cues are matched on
+accent-insensitive text, their weights are summed and only clear-cut scores
+are routed. Everything in between is left to the LLM classifier.
+"""
+
+import re
+import unicodedata
+
+CLASSROOM = "classroom"
+OTHER = "other"
+
+# (pattern, weight) over normalized text (lowercase, no accents).
+CUES = [
+    # the work itself
+    (r"\btareas?\b", 3.0),
+    (r"\bdeberes\b", 3.0),
+    (r"\basignaci(on|ones)\b", 3.0),
+    (r"\bactividad(es)?\b", 1.5),
+    (r"\btrabajos?\b", 1.5),
+    (r"\bproyectos?\b", 1.0),
+    (r"\bexamen(es)?\b", 1.5),
+    (r"\b(homework|assignments?|coursework)\b", 3.0),
+    # deadlines and pending work
+    (r"\bentreg(a|ar|as|o|ue|ada|adas|ado|ados)\b", 2.5),
+    (r"\bpendientes?\b", 2.0),
+    (r"\bvenc(e|en|ida|idas|imiento)\b", 2.0),
+    (r"\batrasad[ao]s?\b", 1.5),
+    (r"\bfechas? (de|limite)\b", 1.5),
+    (r"\bque (hay|tengo) que (hacer|entregar)\b", 2.5),
+    (r"\b(due|deadline)\b", 2.0),
+    # classroom, courses, teachers
+    (r"\bclassroom\b", 4.0),
+    (r"\bcursos?\b", 1.5),
+    (r"\bclases?\b", 1.5),
+    (r"\bmaterias?\b", 1.5),
+    (r"\bprofe(sor|sora|sores|soras)?\b", 1.5),
+    (r"\bmaestr[ao]s?\b", 1.0),
+    (
+        r"\b(matematicas?|ingles|english|espanol|lengua|ciencias|sociales|informatica"
+        r"|historia|fisica|quimica|biologia|geografia|filosofia|tecnologia)\b",
+        1.5,
+    ),
+    # small talk and general questions
+    (r"\b(hola|buenas|buenos dias|buenas tardes|buenas noches|hey)\b", -1.0),
+    (r"\b(gracias|adios|chao)\b", -1.5),
+    (r"\bcomo estas\b", -2.0),
+    (r"\b(clima|llover|lluvia|temperatura)\b", -2.5),
+    (r"\bque tiempo hace\b", -3.0),
+    (r"\b(chiste|receta|pelicula|cancion|futbol|partido|noticias)\b", -2.5),
+    (r"\b(quien eres|que eres|como te llamas)\b", -3.0),
+]
+
+_COMPILED = [(re.compile(pattern), weight) for pattern, weight in CUES]
+
+# Scores at or beyond these thresholds are routed without the LLM.
+CLASSROOM_THRESHOLD = 2.5
+OTHER_THRESHOLD = -1.0
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation to spaces."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^\w]+", " ", stripped).split())
+
+
+def score(text: str) -> float:
+    """Sum of the weights of every cue found in the text."""
+    normalized = normalize(text)
+    return sum(weight for pattern, weight in _COMPILED if pattern.search(normalized))
+
+
+def route(text: str) -> str | None:
+    """Return CLASSROOM or OTHER when the text is clear-cut, None otherwise."""
+    s = score(text)
+    if s >= CLASSROOM_THRESHOLD:
+        return CLASSROOM
+    if s <= OTHER_THRESHOLD:
+        return OTHER
+    return None
@@ -0,0 +1,144 @@
+"""Quota-aware scheduling of Classroom API calls.
+
+Every call goes through one ``QuotaScheduler``: a token bucket keeps the
+sustained request rate under the per-user quota (allowing short bursts), and
+throttled (429) or temporarily failing (5xx) calls are retried with jittered
+exponential backoff instead of being reported as empty results. A
+``Retry-After`` header wins over the computed backoff, and a 429 pauses the
+whole bucket so concurrent workers back off together rather than each
+hammering the quota on its own.
+"""
+
+import email.utils
+import os
+import random
+import threading
+import time
+from typing import Any, Callable
+
+from metrics import metrics
+
+# Sustained requests per second and burst size. Classroom's default per-user
+# quota is in the order of 1200 requests per minute.
+DEFAULT_RATE = float(os.environ.get("CLASSROOM_QUOTA_RATE", "20"))
+DEFAULT_BURST = int(os.environ.get("CLASSROOM_QUOTA_BURST", "40"))
+DEFAULT_MAX_RETRIES = int(os.environ.get("CLASSROOM_MAX_RETRIES", "5"))
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def error_status(exc: BaseException) -> int | None:
+    """HTTP status of a googleapiclient HttpError (or look-alike), else None."""
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    return error_status(exc) in RETRY_STATUSES
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds requested by a Retry-After header (delta or HTTP date), if any."""
+    resp = getattr(exc, "resp", None)
+    value = resp.get("retry-after") if hasattr(resp, "get") else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until tokens are available.
+
+    A rate of 0 disables rate limiting but still honours ``pause``.
+    Tokens are reserved up front (the balance may go negative), so waiting
+    callers are served in arrival order without busy-looping.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, n: float = 1) -> float:
+        """Take n tokens, sleeping as long as needed; returns the time waited."""
+        with self._lock:
+            now = self.clock()
+            wait = max(self._paused_until - now, 0.0)
+            if self.rate > 0:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                self._tokens -= n
+                wait = max(-self._tokens / self.rate, wait)
+        if wait:
+            self.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """Hold every caller back for the given time (e.g. after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+
+
+class QuotaScheduler:
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: float = DEFAULT_BURST,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 0.5,
+        max_delay: float = 32.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.bucket = TokenBucket(rate, burst, sleep=sleep)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry number (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, fn: Callable[[], Any], cost: int = 1) -> Any:
+        """Run fn once quota allows, retrying throttled and 5xx failures.
+
+        ``cost`` is the number of API calls fn makes (a batch counts each of
+        its inner calls). The last error is raised once retries run out.
+        """
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire(cost)
+            if waited:
+                metrics.observe("scheduler.wait", waited)
+            try:
+                return fn()
+            except Exception as e:
+                status = error_status(e)
+                if status not in RETRY_STATUSES or attempt >= self.max_retries:
+                    raise
+                delay = retry_after(e)
+                if delay is None:
+                    delay = self.backoff(attempt)
+                metrics.incr(f"scheduler.retries.{status}")
+                metrics.log("retry", status=status, attempt=attempt + 1, delay=round(delay, 3))
+                if status == 429:
+                    self.bucket.pause(delay)
+                else:
+                    self.sleep(delay)
+                attempt += 1
@@ -0,0 +1,223 @@
+"""Local SQLite store for Classroom courses and courseWork.
+
+Rows are keyed by the Classroom id and keep the raw API resource as JSON
+next to the columns sync needs (``updateTime``, owning course, position).
+``sync_state`` remembers, per course, the newest ``updateTime`` seen (the
+watermark) and when the course was last synced, so a refresh only asks the
+API for what changed since then. Incremental pulls cannot see deletions, so
+it also remembers when each course was last listed in full. Coursework ids
+are also kept in a ``DueIndex`` (built on the first due-date query, then
+maintained on every write) so due-date windows are answered without
+scanning the table.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from deadlines import DueIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    update_time TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS coursework (
+    id TEXT PRIMARY KEY,
+    course_id TEXT NOT NULL,
+    update_time TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coursework_course ON coursework (course_id, update_time);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at REAL NOT NULL
+);
+"""
+
+COURSES_KEY = "courses"
+
+
+def _course_key(course_id) -> str:
+    return f"course:{course_id}"
+
+
+def _full_key(course_id) -> str:
+    return f"full:{course_id}"
+
+
+class CourseworkStore:
+    """Thread-safe wrapper around one SQLite connection."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._due: DueIndex | None = None
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # -- sync bookkeeping -------------------------------------------------
+
+    def _state(self, key):
+        row = self._conn.execute(
+            "SELECT watermark, synced_at FROM sync_state WHERE key = ?", (key,)
+        ).fetchone()
+        return row
+
+    def _mark(self, key, watermark=None):
+        self._conn.execute(
+            "INSERT INTO sync_state (key, watermark, synced_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET watermark = excluded.watermark, synced_at = excluded.synced_at",
+            (key, watermark, time.time()),
+        )
+
+    def courses_age(self) -> float:
+        """Seconds since the course list was last synced (inf if never)."""
+        with self._lock:
+            row = self._state(COURSES_KEY)
+        return time.time() - row[1] if row else float("inf")
+
+    def coursework_age(self, course_id) -> float:
+        """Seconds since the course's coursework was last synced (inf if never)."""
+        with self._lock:
+            row = self._state(_course_key(course_id))
+        return time.time() - row[1] if row else float("inf")
+
+    def full_sync_age(self, course_id) -> float:
+        """Seconds since the course's coursework was last replaced by a full
+        listing (inf if never)."""
+        with self._lock:
+            row = self._state(_full_key(course_id))
+        return time.time() - row[1] if row else float("inf")
+
+    def watermark(self, course_id) -> str | None:
+        """Newest coursework updateTime stored for the course, None if never synced."""
+        with self._lock:
+            row = self._state(_course_key(course_id))
+        return (row[0] or "") if row else None
+
+    # -- courses ----------------------------------------------------------
+
+    def courses(self) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM courses ORDER BY position").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def upsert_courses(self, courses: list[dict]) -> list[str]:
+        """Replace the course list; return ids that are new or whose updateTime changed.
+
+        Courses that disappeared from the list are dropped along with their
+        coursework.
+        """
+        with self._lock, self._conn:
+            known = dict(self._conn.execute("SELECT id, update_time FROM courses"))
+            changed = []
+            seen = set()
+            for position, course in enumerate(courses):
+                cid = str(course.get("id") or "")
+                if not cid or cid in seen:
+                    continue
+                seen.add(cid)
+                update_time = course.get("updateTime")
+                if cid not in known or known[cid] != update_time:
+                    changed.append(cid)
+                self._conn.execute(
+                    "INSERT INTO courses (id, position, update_time, data) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET position = excluded.position, "
+                    "update_time = excluded.update_time, data = excluded.data",
+                    (cid, position, update_time, json.dumps(course, ensure_ascii=False)),
+                )
+            for cid in set(known) - seen:
+                self._conn.execute("DELETE FROM courses WHERE id = ?", (cid,))
+                self._conn.execute("DELETE FROM coursework WHERE course_id = ?", (cid,))
+                self._conn.execute(
+                    "DELETE FROM sync_state WHERE key IN (?, ?)", (_course_key(cid), _full_key(cid))
+                )
+                if self._due is not None:
+                    self._due.remove_course(cid)
+            self._mark(COURSES_KEY)
+        return changed
+
+    # -- coursework -------------------------------------------------------
+
+    def coursework(self, course_ids=None) -> list[dict]:
+        """Stored coursework, grouped by course, newest update first."""
+        query = (
+            "SELECT w.data FROM coursework w LEFT JOIN courses c ON c.id = w.course_id"
+        )
+        args = ()
+        if course_ids is not None:
+            course_ids = [str(cid) for cid in course_ids]
+            query += f" WHERE w.course_id IN ({','.join('?' * len(course_ids))})"
+            args = tuple(course_ids)
+        query += " ORDER BY c.position, w.course_id, w.update_time DESC"
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def coursework_due(self, start: float | None = None, end: float | None = None, course_ids=None) -> list[dict]:
+        """Stored coursework due in [start, end) (POSIX seconds, None = open),
+        soonest first; see deadlines.due_window for building the bounds."""
+        with self._lock:
+            if self._due is None:
+                rows = self._conn.execute("SELECT id, course_id, data FROM coursework").fetchall()
+                tasks = [{**json.loads(data), "courseId": cid} for _, cid, data in rows]
+                self._due = DueIndex()
+                self._due.replace_all(tasks, [tid for tid, _, _ in rows])
+            ids = self._due.between(start, end, course_ids)
+            found = {}
+            # Stay under SQLite's limit on bound parameters.
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                found.update(self._conn.execute(
+                    f"SELECT id, data FROM coursework WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall())
+        return [json.loads(found[tid]) for tid in ids if tid in found]
+
+    def _write_coursework(self, course_id, items):
+        self._conn.executemany(
+            "INSERT INTO coursework (id, course_id, update_time, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET course_id = excluded.course_id, "
+            "update_time = excluded.update_time, data = excluded.data",
+            [
+                (str(item["id"]), course_id, item.get("updateTime"), json.dumps(item, ensure_ascii=False))
+                for item in items
+                if item.get("id")
+            ],
+        )
+        if self._due is not None:
+            for item in items:
+                if item.get("id"):
+                    self._due.add({**item, "courseId": course_id}, str(item["id"]))
+
+    def replace_coursework(self, course_id, items: list[dict]):
+        """Store the full coursework listing of a course, dropping anything else."""
+        course_id = str(course_id)
+        watermark = max((i.get("updateTime") or "" for i in items), default="")
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM coursework WHERE course_id = ?", (course_id,))
+            if self._due is not None:
+                self._due.remove_course(course_id)
+            self._write_coursework(course_id, items)
+            self._mark(_course_key(course_id), watermark)
+            self._mark(_full_key(course_id))
+
+    def upsert_coursework(self, course_id, items: list[dict]):
+        """Merge coursework updated since the watermark into the course."""
+        course_id = str(course_id)
+        with self._lock, self._conn:
+            row = self._state(_course_key(course_id))
+            watermark = max(
+                [(row[0] or "") if row else ""] + [i.get("updateTime") or "" for i in items]
+            )
+            self._write_coursework(course_id, items)
+            self._mark(_course_key(course_id), watermark)